@@ -0,0 +1,35 @@
+from fastapi import APIRouter, Depends, status
+from app.core.admission import admission_stats
+from app.core.security import get_current_admin_user
+from app.models.user import User
+from app.services.engines import engine_status
+from app.services.jurisdictions import jurisdiction_registry
+from app.services.storage import file_sweeper
+
+router = APIRouter()
+
+@router.get("/admission")
+def get_admission_metrics(current_user: User = Depends(get_current_admin_user)):
+    """Admitted versus rejected work for each class of CPU-heavy operation"""
+    return admission_stats()
+
+@router.get("/storage")
+def get_storage_report(current_user: User = Depends(get_current_admin_user)):
+    """Files, directories and bytes reclaimed by the upload sweeper since startup"""
+    return file_sweeper.report()
+
+@router.post("/storage/sweep", status_code=status.HTTP_202_ACCEPTED)
+def sweep_storage(current_user: User = Depends(get_current_admin_user)):
+    """Queue a sweep for project directories and files no document references"""
+    file_sweeper.sweep_orphans()
+    return {"message": "Storage sweep scheduled", **file_sweeper.report()}
+
+@router.get("/jurisdictions")
+def get_jurisdiction_status(current_user: User = Depends(get_current_admin_user)):
+    """Active rule version per jurisdiction and any files rejected on reload"""
+    return jurisdiction_registry.status()
+
+@router.get("/engines")
+def get_engine_status(current_user: User = Depends(get_current_admin_user)):
+    """Which heavy engines this worker has imported and what preloading them cost"""
+    return engine_status()
@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from datetime import timedelta
 from app.core.database import get_db
+from app.core.admission import admit, hashing_limiter
 from app.core.security import (
     get_password_hash,
     verify_password,
@@ -14,7 +15,12 @@ from app.models.user import User as UserModel
 
 router = APIRouter()
 
-@router.post("/register", response_model=User, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/register",
+    response_model=User,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(admit(hashing_limiter))]
+)
 def register(user: UserCreate, db: Session = Depends(get_db)):
     """Register a new user"""
     # Check if email exists
@@ -48,7 +54,7 @@ def register(user: UserCreate, db: Session = Depends(get_db)):
     
     return db_user
 
-@router.post("/login", response_model=Token)
+@router.post("/login", response_model=Token, dependencies=[Depends(admit(hashing_limiter))])
 def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
     """Login and get access token"""
     # Find user by username
@@ -1,19 +1,28 @@
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from pathlib import Path
+from typing import Optional
+import logging
 import shutil
 import os
 from app.core.database import get_db
+from app.core.admission import admit, validation_limiter
+from app.core.security import get_current_active_user
 from app.schemas.project import Document, DocumentCreate
-from app.models.project import Document as DocumentModel, Project as ProjectModel, ValidationResult
-from app.services.pdf_parser import PDFParser
+from app.models.project import Document as DocumentModel, Project as ProjectModel, ValidationResult, ValidationEvidence, DocumentText
+from app.models.user import User
+from app.services.engines import load_engine
+from app.services.events import event_broker
+from app.services.readiness import compute_progress
+from app.services.search_index import index_document
+from app.services.storage import UPLOAD_DIR
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
-UPLOAD_DIR = Path("uploads")
 UPLOAD_DIR.mkdir(exist_ok=True)
 
-@router.post("/", response_model=Document)
+@router.post("/", response_model=Document, dependencies=[Depends(admit(validation_limiter))])
 async def upload_document(
     project_id: int = Form(...),
     checklist_item_id: str = Form(...),
@@ -25,6 +34,9 @@ async def upload_document(
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
+    checklist = (project.jurisdiction_data or {}).get('checklist', [])
+    progress_before = _progress_if_watched(project, checklist)
+    
     # Create project-specific directory
     project_dir = UPLOAD_DIR / str(project_id)
     project_dir.mkdir(exist_ok=True)
@@ -48,18 +60,67 @@ async def upload_document(
     db.commit()
     db.refresh(db_document)
     
+    event_broker.publish(
+        project_id, 'upload_received',
+        document_id=db_document.id,
+        checklist_item_id=checklist_item_id,
+        filename=db_document.filename,
+        file_size=db_document.file_size
+    )
+    
     # Parse PDF if it's a PDF file
     if file.filename.lower().endswith('.pdf'):
+        # Loaded here so workers don't pay for PyPDF2 until they handle a PDF
+        pdf_parser = load_engine("pdf")
+        PDFParser, join_pages = pdf_parser.PDFParser, pdf_parser.join_pages
+        
         try:
+            # A structural scan first: it is cheap, and tells the user straight
+            # away when pages are scanned images that can never pass text checks
+            page_kinds = await run_in_threadpool(PDFParser.scan_pages, str(file_path))
+            if page_kinds is not None:
+                event_broker.publish(
+                    project_id, 'document_scanned',
+                    document_id=db_document.id,
+                    checklist_item_id=checklist_item_id,
+                    page_count=len(page_kinds),
+                    **PDFParser.summarize_page_kinds(page_kinds)
+                )
+            
+            # Extract once: the pages feed validation, evidence and the search index
+            pages = await run_in_threadpool(PDFParser.extract_pages, str(file_path), None, page_kinds)
+            text = join_pages(pages)
+            if text.strip():
+                index_document(db, db_document, text)
+                db.commit()
+            
             # Find the checklist item to get validation rules
-            checklist = project.jurisdiction_data.get('checklist', [])
             checklist_item = next((item for item in checklist if item['id'] == checklist_item_id), None)
             
             if checklist_item and 'validationRules' in checklist_item:
                 validation_rules = checklist_item['validationRules']
                 
-                # Validate the PDF
-                validation_result = PDFParser.validate_document(str(file_path), validation_rules)
+                event_broker.publish(
+                    project_id, 'validation_started',
+                    document_id=db_document.id,
+                    checklist_item_id=checklist_item_id,
+                    rules=list(validation_rules)
+                )
+                
+                def on_rule(rule, passed, details):
+                    event_broker.publish(
+                        project_id, 'rule_result',
+                        document_id=db_document.id,
+                        checklist_item_id=checklist_item_id,
+                        rule=rule,
+                        passed=passed,
+                        details=details
+                    )
+                
+                # Validate the PDF off the event loop so progress events can be delivered
+                validation_result = await run_in_threadpool(
+                    PDFParser.validate_document, str(file_path), validation_rules, on_rule, text, pages, page_kinds
+                )
                 
                 # Store validation result
                 status = 'pass' if validation_result['valid'] else 'warning'
@@ -78,6 +139,16 @@ async def upload_document(
                 )
                 
                 db.add(db_validation)
+                db.flush()
+                db.add_all(
+                    ValidationEvidence(
+                        validation_id=db_validation.id,
+                        document_id=db_document.id,
+                        project_id=project_id,
+                        **match
+                    )
+                    for match in validation_result['evidence']
+                )
                 db.commit()
             else:
                 # No validation rules, just mark as pass
@@ -91,7 +162,8 @@ async def upload_document(
                 db.commit()
                 
         except Exception as e:
-            print(f"Error validating PDF: {e}")
+            # Covers scanning, indexing and evidence too; keep the traceback
+            logger.exception("Error validating PDF %s (document %s)", file_path, db_document.id)
             # Store error in validation result
             db_validation = ValidationResult(
                 project_id=project_id,
@@ -101,10 +173,34 @@ async def upload_document(
             )
             db.add(db_validation)
             db.commit()
+        
+        event_broker.publish(
+            project_id, 'validation_finished',
+            document_id=db_document.id,
+            checklist_item_id=checklist_item_id,
+            status=db_validation.status,
+            notes=db_validation.notes
+        )
+    
+    _publish_readiness(project, checklist, progress_before)
     
     return db_document
 
-@router.get("/{document_id}/summary")
+def _progress_if_watched(project, checklist):
+    # Skip loading documents when nobody is listening for readiness events
+    if not event_broker.has_subscribers(project.id):
+        return None
+    return compute_progress(checklist, project.documents)
+
+def _publish_readiness(project, checklist, progress_before):
+    """Emit readiness_changed if the project's completion moved"""
+    if progress_before is None:
+        return
+    progress = compute_progress(checklist, project.documents)
+    if progress != progress_before:
+        event_broker.publish(project.id, 'readiness_changed', previous=progress_before, **progress)
+
+@router.get("/{document_id}/summary", dependencies=[Depends(admit(validation_limiter))])
 def get_document_summary(document_id: int, db: Session = Depends(get_db)):
     """Get a summary of document contents (for PDFs)"""
     document = db.query(DocumentModel).filter(DocumentModel.id == document_id).first()
@@ -114,6 +210,8 @@ def get_document_summary(document_id: int, db: Session = Depends(get_db)):
     if not document.filename.lower().endswith('.pdf'):
         raise HTTPException(status_code=400, detail="Only PDF files can be summarized")
     
+    PDFParser = load_engine("pdf").PDFParser
+    
     try:
         summary = PDFParser.get_document_summary(document.file_path)
         return summary
@@ -141,23 +239,74 @@ def get_document_validation(document_id: int, db: Session = Depends(get_db)):
         "validated_at": validation.validated_at
     }
 
+@router.get("/{document_id}/evidence")
+def get_document_evidence(
+    document_id: int,
+    rule: Optional[str] = None,
+    page: Optional[int] = None,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Where each validation rule matched in a document, by page and character offsets"""
+    document = db.query(DocumentModel).join(ProjectModel).filter(
+        DocumentModel.id == document_id,
+        ProjectModel.user_id == current_user.id
+    ).first()
+    if not document:
+        raise HTTPException(status_code=404, detail="Document not found")
+    
+    query = db.query(
+        ValidationEvidence.rule, ValidationEvidence.term, ValidationEvidence.page,
+        ValidationEvidence.start, ValidationEvidence.end
+    ).filter(ValidationEvidence.document_id == document_id)
+    if rule is not None:
+        query = query.filter(ValidationEvidence.rule == rule)
+    if page is not None:
+        query = query.filter(ValidationEvidence.page == page)
+    
+    return {
+        "document_id": document_id,
+        "checklist_item_id": document.checklist_item_id,
+        "evidence": [dict(row._mapping) for row in query.order_by(ValidationEvidence.page, ValidationEvidence.start)]
+    }
+
 @router.delete("/{document_id}")
 def delete_document(document_id: int, db: Session = Depends(get_db)):
     document = db.query(DocumentModel).filter(DocumentModel.id == document_id).first()
     if not document:
         raise HTTPException(status_code=404, detail="Document not found")
     
+    project = document.project
+    checklist = (project.jurisdiction_data or {}).get('checklist', [])
+    progress_before = _progress_if_watched(project, checklist)
+    
     # Delete file from filesystem
     if os.path.exists(document.file_path):
         os.remove(document.file_path)
     
-    # Delete validation results
+    # Delete validation results and their evidence
+    validations = db.query(ValidationResult.id).filter(
+        ValidationResult.project_id == document.project_id,
+        ValidationResult.checklist_item_id == document.checklist_item_id
+    )
+    db.query(ValidationEvidence).filter(
+        (ValidationEvidence.validation_id.in_(validations.scalar_subquery()))
+        | (ValidationEvidence.document_id == document.id)
+    ).delete(synchronize_session=False)
     db.query(ValidationResult).filter(
         ValidationResult.project_id == document.project_id,
         ValidationResult.checklist_item_id == document.checklist_item_id
     ).delete()
     
+    db.query(DocumentText).filter(DocumentText.document_id == document.id).delete(synchronize_session=False)
     db.delete(document)
     db.commit()
     
+    event_broker.publish(
+        project.id, 'document_deleted',
+        document_id=document_id,
+        checklist_item_id=document.checklist_item_id
+    )
+    _publish_readiness(project, checklist, progress_before)
+    
     return {"message": "Document deleted successfully"}
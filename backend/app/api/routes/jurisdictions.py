@@ -0,0 +1,51 @@
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
+import os
+from app.services.jurisdictions import EncodedPayload, jurisdiction_registry
+
+router = APIRouter()
+
+# Clients revalidate with If-None-Match after this, which costs a 304 at most
+JURISDICTION_CACHE_MAX_AGE = int(os.getenv("JURISDICTION_CACHE_MAX_AGE", "86400"))
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    # Any encoding's tag for the same content counts as a match
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip().removeprefix("W/")
+        if candidate == "*" or candidate.rsplit("-", 1)[0].rstrip('"') == etag.rstrip('"'):
+            return True
+    return False
+
+
+def _precompressed(request: Request, payload: EncodedPayload) -> Response:
+    encoding, body = payload.choose(request.headers.get("accept-encoding", ""))
+    # Each encoding is a different byte sequence, so it gets its own strong tag
+    etag = payload.etag if encoding == "identity" else f'{payload.etag[:-1]}-{encoding}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={JURISDICTION_CACHE_MAX_AGE}",
+        "Vary": "Accept-Encoding",
+    }
+    if _etag_matches(request.headers.get("if-none-match", ""), payload.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    if encoding != "identity":
+        # Also tells GZipMiddleware to leave the body alone
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@router.get("/")
+def list_jurisdictions(request: Request, view: str = Query("full", pattern="^(full|slim)$")):
+    """All jurisdictions; view=slim returns only id, name, state and version"""
+    catalog = jurisdiction_registry.catalog
+    return _precompressed(request, catalog.slim if view == "slim" else catalog.full)
+
+
+@router.get("/{jurisdiction_id}")
+def get_jurisdiction(jurisdiction_id: str, request: Request):
+    """The full jurisdiction definition, including its checklist"""
+    jurisdiction = jurisdiction_registry.get(jurisdiction_id)
+    if not jurisdiction:
+        raise HTTPException(status_code=404, detail="Jurisdiction not found")
+    return _precompressed(request, jurisdiction.encoded)
@@ -1,23 +1,87 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, WebSocket, WebSocketDisconnect
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
-from typing import List
-from app.core.database import get_db
-from app.core.security import get_current_active_user
-from app.schemas.project import Project, ProjectCreate, ProjectSummary
-from app.models.project import Project as ProjectModel
+from sqlalchemy.sql import func
+from typing import List, Optional
+from pydantic import ValidationError
+import asyncio
+import copy
+import uuid
+from app.core.database import get_db, SessionLocal
+from app.core.admission import admit, report_limiter
+from app.core.security import get_current_active_user, get_user_from_token
+from app.schemas.project import Project, ProjectCreate, ProjectSummary, ProjectBulkDelete, ChecklistOperation, ChecklistPatch
+from app.models.project import Project as ProjectModel, Document as DocumentModel
 from app.models.user import User
 from fastapi.responses import StreamingResponse
-from app.services.report_generator import generate_readiness_report
+from app.services.readiness import RENDERERS, compute_progress, readiness_cache, readiness_fingerprint
+from app.services.dashboard import dashboard_cache
+from app.services.engines import load_engine
+from app.services.events import event_broker
+from app.services.jurisdictions import jurisdiction_registry
+from app.services.storage import delete_projects
 
 router = APIRouter()
 
+# Slices a client can request with GET /api/projects/{id}?fields=...
+PROJECT_FIELDS = ("summary", "status", "documents", "checklist", "jurisdiction_data")
+
+
+def _document_view(document):
+    # Deliberately omits file_path, which is a server-side detail
+    return {
+        "id": document.id,
+        "checklist_item_id": document.checklist_item_id,
+        "filename": document.filename,
+        "file_size": document.file_size,
+        "file_type": document.file_type,
+        "uploaded_at": document.uploaded_at,
+    }
+
+
+def _project_view(project, fields):
+    """Build a compact project response containing only the requested slices"""
+    jurisdiction_data = project.jurisdiction_data or {}
+    view = {"id": project.id, "version": project.version}
+
+    if "summary" in fields:
+        view.update(
+            name=project.name,
+            jurisdiction=project.jurisdiction,
+            created_at=project.created_at,
+            updated_at=project.updated_at,
+        )
+    if "status" in fields:
+        view["status"] = compute_progress(jurisdiction_data.get("checklist", []), project.documents)
+    if "documents" in fields:
+        view["documents"] = [_document_view(doc) for doc in project.documents]
+    if "checklist" in fields:
+        view["checklist"] = jurisdiction_data.get("checklist", [])
+    if "jurisdiction_data" in fields:
+        view["jurisdiction_data"] = project.jurisdiction_data
+
+    return view
+
 @router.post("/", response_model=Project)
 def create_project(
     project: ProjectCreate,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
-    db_project = ProjectModel(**project.dict(), user_id=current_user.id)
+    """
+    Create a project from a catalog jurisdiction_id
+
+    A client-posted jurisdiction_data is accepted only as a legacy fallback
+    when no jurisdiction_id is given; it is stored as sent, unvalidated.
+    """
+    values = project.dict(exclude={"jurisdiction_id"})
+    if project.jurisdiction_id:
+        jurisdiction = jurisdiction_registry.get(project.jurisdiction_id)
+        if not jurisdiction:
+            raise HTTPException(status_code=400, detail=f"Unknown jurisdiction '{project.jurisdiction_id}'")
+        # Each project keeps its own copy so later rule updates don't change it
+        values["jurisdiction_data"] = copy.deepcopy(jurisdiction.data)
+    db_project = ProjectModel(**values, user_id=current_user.id)
     db.add(db_project)
     db.commit()
     db.refresh(db_project)
@@ -54,12 +118,35 @@ def list_projects(
     
     return summaries
 
+@router.get("/dashboard")
+def get_dashboard(
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Readiness across all of the user's projects; cached briefly, so may lag by a few seconds"""
+    return dashboard_cache.get(db, current_user.id)
+
 @router.get("/{project_id}", response_model=Project)
 def get_project(
     project_id: int,
+    fields: Optional[str] = Query(
+        None,
+        description="Comma separated slices to return instead of the full project: "
+                    + ", ".join(PROJECT_FIELDS)
+    ),
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
+    requested = None
+    if fields is not None:
+        requested = {field.strip() for field in fields.split(",") if field.strip()}
+        unknown = requested - set(PROJECT_FIELDS)
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown fields: {', '.join(sorted(unknown))}. Allowed: {', '.join(PROJECT_FIELDS)}"
+            )
+    
     project = db.query(ProjectModel).filter(
         ProjectModel.id == project_id,
         ProjectModel.user_id == current_user.id
@@ -67,6 +154,10 @@ def get_project(
     
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
+    
+    if requested is not None:
+        # Bypass response_model validation; orjson serializes the plain dict directly
+        return ORJSONResponse(_project_view(project, requested))
     return project
 
 @router.delete("/{project_id}")
@@ -75,7 +166,7 @@ def delete_project(
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
-    project = db.query(ProjectModel).filter(
+    project = db.query(ProjectModel.id).filter(
         ProjectModel.id == project_id,
         ProjectModel.user_id == current_user.id
     ).first()
@@ -83,11 +174,69 @@ def delete_project(
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
-    db.delete(project)
-    db.commit()
-    return {"message": "Project deleted successfully"}
+    result = delete_projects(db, [project_id])
+    return {"message": "Project deleted successfully", **result}
+
+@router.post("/bulk-delete")
+def bulk_delete_projects(
+    request: ProjectBulkDelete,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Delete many projects at once, e.g. to archive everything created before a date"""
+    query = db.query(ProjectModel.id).filter(ProjectModel.user_id == current_user.id)
+    if request.project_ids is not None:
+        query = query.filter(ProjectModel.id.in_(request.project_ids))
+    if request.created_before is not None:
+        query = query.filter(ProjectModel.created_at < request.created_before)
+    
+    project_ids = [row.id for row in query]
+    result = delete_projects(db, project_ids)
+    return {"message": f"{len(project_ids)} projects deleted", **result}
+
+@router.get("/{project_id}/readiness")
+def get_readiness(
+    project_id: int,
+    request: Request,
+    format: str = Query("json", pattern="^(json|html)$"),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    The readiness report as JSON or HTML, for showing in the app
+
+    Uses the same model as the PDF report. Revalidate with If-None-Match: the
+    ETag is checked from a few narrow columns before anything is rendered.
+    """
+    project = db.query(
+        ProjectModel.id, ProjectModel.version, ProjectModel.name, ProjectModel.jurisdiction
+    ).filter(
+        ProjectModel.id == project_id,
+        ProjectModel.user_id == current_user.id
+    ).first()
+    
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    
+    # Ordered like project.documents so "first uploaded file" agrees across renderings
+    documents = db.query(
+        DocumentModel.id, DocumentModel.checklist_item_id, DocumentModel.filename
+    ).filter(DocumentModel.project_id == project_id).order_by(DocumentModel.id).all()
+    
+    fingerprint = readiness_fingerprint(project, documents)
+    etag = f'"{fingerprint}-{format}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag in [tag.strip().removeprefix("W/") for tag in request.headers.get("if-none-match", "").split(",")]:
+        return Response(status_code=304, headers=headers)
+    
+    def load():
+        full = db.query(ProjectModel).filter(ProjectModel.id == project_id).first()
+        return full, sorted(full.documents, key=lambda document: document.id)
+    
+    body = readiness_cache.render(project_id, format, fingerprint, load)
+    return Response(content=body, media_type=RENDERERS[format][0], headers=headers)
 
-@router.get("/{project_id}/report")
+@router.get("/{project_id}/report", dependencies=[Depends(admit(report_limiter))])
 def download_report(
     project_id: int,
     current_user: User = Depends(get_current_active_user),
@@ -101,6 +250,9 @@ def download_report(
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
+    # ReportLab is only loaded once a worker actually renders a report
+    generate_readiness_report = load_engine("report").generate_readiness_report
+    
     pdf_buffer = generate_readiness_report(project, project.documents)
     
     return StreamingResponse(
@@ -111,6 +263,55 @@ def download_report(
         }
     )
 
+@router.websocket("/{project_id}/events")
+async def project_events(websocket: WebSocket, project_id: int, token: str = Query(...)):
+    """
+    Push channel for a project's upload, validation and readiness events
+    
+    Browsers cannot set headers on WebSocket requests, so the access token
+    is passed as ?token=. Events are JSON objects with a 'type' of
+    upload_received, document_scanned, validation_started, rule_result,
+    validation_finished, document_deleted or readiness_changed.
+    """
+    db = SessionLocal()
+    try:
+        # Deactivated users are refused as on every other route
+        user = await get_current_active_user(get_user_from_token(token, db))
+        project = db.query(ProjectModel.id).filter(
+            ProjectModel.id == project_id,
+            ProjectModel.user_id == user.id
+        ).first()
+    except HTTPException:
+        project = None
+    finally:
+        db.close()
+    
+    if not project:
+        await websocket.close(code=1008)
+        return
+    
+    queue = event_broker.subscribe(project_id)
+    await websocket.accept()
+    receiver = asyncio.ensure_future(websocket.receive())
+    try:
+        while True:
+            getter = asyncio.ensure_future(queue.get())
+            done, _ = await asyncio.wait({getter, receiver}, return_when=asyncio.FIRST_COMPLETED)
+            if getter in done:
+                await websocket.send_json(getter.result())
+            else:
+                getter.cancel()
+            if receiver in done:
+                if receiver.result()["type"] == "websocket.disconnect":
+                    break
+                # Clients have nothing to say on this channel; ignore and keep listening
+                receiver = asyncio.ensure_future(websocket.receive())
+    except WebSocketDisconnect:
+        pass
+    finally:
+        receiver.cancel()
+        event_broker.unsubscribe(project_id, queue)
+
 @router.post("/{project_id}/custom-items")
 def add_custom_item(
     project_id: int,
@@ -118,30 +319,17 @@ def add_custom_item(
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
-    project = db.query(ProjectModel).filter(
-        ProjectModel.id == project_id,
-        ProjectModel.user_id == current_user.id
-    ).first()
-    
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
-    
-    if not project.jurisdiction_data:
-        project.jurisdiction_data = {"checklist": []}
-    
-    if "checklist" not in project.jurisdiction_data:
-        project.jurisdiction_data["checklist"] = []
-    
-    item["custom"] = True
-    project.jurisdiction_data["checklist"].append(item)
-    
-    from sqlalchemy.orm.attributes import flag_modified
-    flag_modified(project, "jurisdiction_data")
+    """Legacy single-item form of PATCH /checklist with an add operation"""
+    # This endpoint always accepted items without an id; give them one so they can be removed
+    if not item.get("id"):
+        item = {**item, "id": f"custom-{uuid.uuid4().hex[:8]}"}
+    try:
+        operation = ChecklistOperation(op="add", item=item)
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    db.commit()
-    db.refresh(project)
-    
-    return {"message": "Custom item added", "item": item}
+    _update_checklist(db, project_id, current_user, None, [operation])
+    return {"message": "Custom item added", "item": {**item, "custom": True}}
 
 @router.delete("/{project_id}/custom-items/{item_id}")
 def remove_custom_item(
@@ -150,6 +338,46 @@ def remove_custom_item(
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
+    """Legacy single-item form of PATCH /checklist with a remove operation"""
+    _update_checklist(db, project_id, current_user, None, [ChecklistOperation(op="remove", item_id=item_id)])
+    return {"message": "Custom item removed"}
+
+
+def _apply_checklist_operations(checklist, operations):
+    """Apply add/remove/update operations to a copy of the checklist, all or nothing"""
+    checklist = copy.deepcopy(checklist)
+    
+    def find_custom(item_id):
+        index = next(
+            (i for i, item in enumerate(checklist) if item.get("id") == item_id and item.get("custom")),
+            None
+        )
+        if index is None:
+            raise HTTPException(status_code=404, detail=f"Custom item not found: {item_id}")
+        return index
+    
+    for operation in operations:
+        if operation.op == "add":
+            if any(item.get("id") == operation.item["id"] for item in checklist):
+                raise HTTPException(status_code=400, detail=f"Checklist item already exists: {operation.item['id']}")
+            checklist.append({**operation.item, "custom": True})
+        elif operation.op == "remove":
+            del checklist[find_custom(operation.item_id)]
+        else:
+            index = find_custom(operation.item_id)
+            changes = {key: value for key, value in operation.changes.items() if key not in ("id", "custom")}
+            checklist[index] = {**checklist[index], **changes}
+    
+    return checklist
+
+def _update_checklist(db, project_id, current_user, version, operations):
+    """
+    Apply checklist operations with a compare-and-swap on the project version
+    
+    version is the one the client last saw; None means the version read here,
+    which still stops a stale blob from overwriting a concurrent edit. Raises
+    409 if the project changed, and returns the new checklist otherwise.
+    """
     project = db.query(ProjectModel).filter(
         ProjectModel.id == project_id,
         ProjectModel.user_id == current_user.id
@@ -158,21 +386,57 @@ def remove_custom_item(
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
-    if not project.jurisdiction_data or "checklist" not in project.jurisdiction_data:
-        raise HTTPException(status_code=404, detail="No checklist found")
+    if version is None:
+        version = project.version
+    if project.version != version:
+        raise HTTPException(
+            status_code=409,
+            detail={"message": "Project was modified by another request", "version": project.version}
+        )
     
-    original_length = len(project.jurisdiction_data["checklist"])
-    project.jurisdiction_data["checklist"] = [
-        item for item in project.jurisdiction_data["checklist"]
-        if not (item.get("id") == item_id and item.get("custom"))
-    ]
+    jurisdiction_data = dict(project.jurisdiction_data or {})
+    jurisdiction_data["checklist"] = _apply_checklist_operations(
+        jurisdiction_data.get("checklist", []), operations
+    )
     
-    if len(project.jurisdiction_data["checklist"]) == original_length:
-        raise HTTPException(status_code=404, detail="Custom item not found")
+    # Compare-and-swap on the version so a concurrent writer between our read and write loses cleanly
+    updated = db.query(ProjectModel).filter(
+        ProjectModel.id == project_id,
+        ProjectModel.version == version
+    ).update({
+        ProjectModel.jurisdiction_data: jurisdiction_data,
+        ProjectModel.version: ProjectModel.version + 1,
+        ProjectModel.updated_at: func.now()
+    }, synchronize_session=False)
     
-    from sqlalchemy.orm.attributes import flag_modified
-    flag_modified(project, "jurisdiction_data")
+    if not updated:
+        db.rollback()
+        current_version = db.query(ProjectModel.version).filter(ProjectModel.id == project_id).scalar()
+        raise HTTPException(
+            status_code=409,
+            detail={"message": "Project was modified by another request", "version": current_version}
+        )
     
     db.commit()
+    return jurisdiction_data["checklist"]
+
+@router.patch("/{project_id}/checklist")
+def patch_checklist(
+    project_id: int,
+    patch: ChecklistPatch,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Apply a batch of custom checklist edits in one transaction
     
-    return {"message": "Custom item removed"}
+    The request carries the project version the client last saw; if the
+    project has changed since, nothing is applied and 409 is returned.
+    """
+    checklist = _update_checklist(db, project_id, current_user, patch.version, patch.operations)
+    
+    return {
+        "message": f"{len(patch.operations)} checklist operations applied",
+        "version": patch.version + 1,
+        "checklist": checklist
+    }
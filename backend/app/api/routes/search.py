@@ -0,0 +1,37 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from app.core.database import get_db
+from app.core.security import get_current_active_user
+from app.models.user import User
+from app.schemas.search import SearchHit
+from app.services.search_index import search_documents, SearchQueryError
+
+router = APIRouter()
+
+@router.get("/", response_model=List[SearchHit])
+def search(
+    q: str = Query(..., description='Terms, "exact phrases", prefix* and -excluded terms'),
+    project_id: Optional[int] = None,
+    checklist_item_id: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Search the text of documents in the current user's projects"""
+    try:
+        return search_documents(
+            db, current_user.id, q,
+            project_id=project_id,
+            checklist_item_id=checklist_item_id,
+            limit=limit,
+            offset=offset
+        )
+    except SearchQueryError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except DBAPIError as e:
+        # Queries the index engine rejects (e.g. a stray operator) are client errors
+        db.rollback()
+        raise HTTPException(status_code=400, detail=f"Invalid search query: {e.orig}")
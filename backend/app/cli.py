@@ -0,0 +1,277 @@
+"""
+Command line tools that run without the API server
+
+Usage (from backend/):
+    python -m app.cli validate ./submission --jurisdiction new-york-city
+    python -m app.cli validate ./submission --jurisdiction ../data/jurisdictions/boston.json \
+        --manifest manifest.json --output results.jsonl
+    python -m app.cli index-documents
+
+validate maps every file in a directory to a checklist item, validates the
+PDFs in parallel and streams one JSON object per file, followed by a summary
+object. It exits with status 1 if any required item is missing or failing.
+It needs no database.
+
+index-documents extracts and indexes the text of every stored PDF that has
+none yet, such as documents uploaded before search existed. It uses the
+configured DATABASE_URL and exits with status 1 if any document failed.
+"""
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List, Optional
+import argparse
+import json
+import os
+import re
+import sys
+from app.services.jurisdictions import JURISDICTIONS_DIR, validate_jurisdiction
+
+
+def load_jurisdiction(value: str) -> Dict:
+    """Load a jurisdiction by file path, file stem (new-york-city) or id (nyc)"""
+    path = Path(value)
+    if not path.is_file():
+        path = JURISDICTIONS_DIR / f"{value}.json"
+    if not path.is_file():
+        for candidate in sorted(JURISDICTIONS_DIR.glob("*.json")):
+            # A broken file elsewhere in the catalog shouldn't hide this one
+            try:
+                data = json.loads(candidate.read_text())
+            except (OSError, ValueError):
+                continue
+            if isinstance(data, dict) and data.get("jurisdiction", {}).get("id") == value:
+                return data
+        raise FileNotFoundError(f"Jurisdiction '{value}' not found in {JURISDICTIONS_DIR}")
+    return json.loads(path.read_text())
+
+
+def _normalize(name: str) -> str:
+    return re.sub(r"[\s_.]+", "-", name.lower())
+
+
+def map_files(files: List[Path], checklist: List[Dict], manifest: Optional[Dict] = None,
+              pattern: Optional[str] = None) -> Dict[Path, Optional[str]]:
+    """
+    Assign each file a checklist item id (or None when nothing matches)
+
+    Precedence: manifest entry for the file name, then --pattern (a regex
+    with an 'item' group), then the longest checklist id contained in the
+    normalized file stem.
+    """
+    item_ids = {item["id"] for item in checklist}
+    # Longest first so 'site-plan-zoning' beats 'site-plan'
+    ids_by_length = sorted(item_ids, key=len, reverse=True)
+    regex = re.compile(pattern) if pattern else None
+
+    mapping = {}
+    for path in files:
+        item_id = None
+        if manifest and path.name in manifest:
+            item_id = manifest[path.name]
+        elif regex:
+            match = regex.search(path.name)
+            item_id = match.group("item") if match else None
+        else:
+            stem = _normalize(path.stem)
+            item_id = next((candidate for candidate in ids_by_length if candidate in stem), None)
+        mapping[path] = item_id if item_id in item_ids else None
+    return mapping
+
+
+def _init_worker():
+    # Each file already gets its own process; don't fan out again per page
+    from app.services import pdf_parser
+    pdf_parser.MAX_WORKERS_PER_DOCUMENT = 1
+
+
+def _validate_file(file_path: str, validation_rules: Dict) -> Dict:
+    from app.services.pdf_parser import PDFParser
+    return PDFParser.validate_document(file_path, validation_rules)
+
+
+def validate_directory(directory: Path, jurisdiction: Dict, manifest: Optional[Dict],
+                       pattern: Optional[str], workers: int, out, progress) -> int:
+    checklist = jurisdiction.get("checklist", [])
+    items = {item["id"]: item for item in checklist}
+    files = sorted(path for path in directory.iterdir() if path.is_file())
+    mapping = map_files(files, checklist, manifest, pattern)
+
+    def emit(record: Dict):
+        out.write(json.dumps(record) + "\n")
+        out.flush()
+
+    # Outcome per checklist item: True once any file for it passes
+    item_passed: Dict[str, bool] = {}
+    pending = {}
+
+    for path, item_id in mapping.items():
+        record = {"type": "file", "file": path.name, "checklist_item_id": item_id}
+        if item_id is None:
+            emit({**record, "status": "unmapped"})
+            continue
+        rules = items[item_id].get("validationRules")
+        if not rules:
+            # Present and there is nothing to check
+            item_passed[item_id] = True
+            emit({**record, "status": "pass", "validated": False})
+            continue
+        item_passed.setdefault(item_id, False)
+        if path.suffix.lower() != ".pdf":
+            # The item has rules we can only check on a PDF, so it can't pass on this file
+            emit({**record, "status": "skipped", "validated": False,
+                  "errors": ["Only PDF files can be validated against this item's rules"]})
+            continue
+        pending[(str(path), item_id)] = rules
+
+    total = len(pending)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        futures = {
+            pool.submit(_validate_file, file_path, rules): (file_path, item_id)
+            for (file_path, item_id), rules in pending.items()
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            file_path, item_id = futures[future]
+            record = {"type": "file", "file": Path(file_path).name, "checklist_item_id": item_id}
+            try:
+                result = future.result()
+            except Exception as e:
+                record.update(status="error", errors=[str(e)])
+            else:
+                passed = result["valid"]
+                item_passed[item_id] = item_passed[item_id] or passed
+                record.update(
+                    status="pass" if passed else "fail",
+                    validated=True,
+                    errors=result["errors"],
+                    warnings=result["warnings"],
+                    details=result["details"],
+                    evidence=result["evidence"],
+                )
+            emit(record)
+            progress(f"[{done}/{total}] {record['file']} -> {item_id}: {record['status']}")
+
+    required = [item_id for item_id, item in items.items() if item.get("required")]
+    missing = [item_id for item_id in required if item_id not in item_passed]
+    failing = [item_id for item_id in required if item_passed.get(item_id) is False]
+    emit({
+        "type": "summary",
+        "jurisdiction": jurisdiction.get("jurisdiction", {}).get("id"),
+        "version": jurisdiction.get("version"),
+        "files": len(files),
+        "unmapped": [path.name for path, item_id in mapping.items() if item_id is None],
+        "required_total": len(required),
+        "missing_required": missing,
+        "failing_required": failing,
+        "ready": not missing and not failing,
+    })
+
+    if missing:
+        progress(f"Missing required items: {', '.join(missing)}")
+    if failing:
+        progress(f"Failing required items: {', '.join(failing)}")
+    return 1 if missing or failing else 0
+
+
+def index_documents(db, progress) -> int:
+    """Extract and index every stored PDF without text; returns 1 if any file was missing"""
+    from app.services.pdf_parser import PDFParser, join_pages
+    from app.services.search_index import index_document, unindexed_documents
+
+    documents = unindexed_documents(db)
+    indexed = failed = 0
+    for done, document in enumerate(documents, start=1):
+        if not os.path.isfile(document.file_path):
+            failed += 1
+            status = "file missing"
+        else:
+            # Image-only pages are skipped, as at upload
+            page_kinds = PDFParser.scan_pages(document.file_path)
+            text = join_pages(PDFParser.extract_pages(document.file_path, page_kinds=page_kinds))
+            if text.strip():
+                index_document(db, document, text)
+                db.commit()
+                indexed += 1
+                status = "indexed"
+            else:
+                status = "no text"
+        progress(f"[{done}/{len(documents)}] document {document.id} ({document.filename}): {status}")
+    progress(f"Indexed {indexed} of {len(documents)} documents without text")
+    return 1 if failed else 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="Permit readiness command line tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    validate = commands.add_parser("validate", help="pre-check a folder of documents against a jurisdiction")
+    validate.add_argument("directory", type=Path)
+    validate.add_argument("--jurisdiction", "-j", required=True,
+                          help="jurisdiction file, or a name/id from data/jurisdictions/")
+    validate.add_argument("--manifest", type=Path, help='JSON object of {"file name": "checklist item id"}')
+    validate.add_argument("--pattern", help="regex with a named group 'item' extracting the checklist id from file names")
+    validate.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    validate.add_argument("--output", "-o", type=Path, help="write JSONL here instead of stdout")
+    validate.add_argument("--quiet", "-q", action="store_true", help="no progress on stderr")
+
+    index = commands.add_parser("index-documents",
+                                help="add stored PDFs that have no extracted text to the search index")
+    index.add_argument("--quiet", "-q", action="store_true", help="no progress on stderr")
+
+    args = parser.parse_args(argv)
+
+    def progress(message: str):
+        if not args.quiet:
+            print(message, file=sys.stderr, flush=True)
+
+    if args.command == "index-documents":
+        import app.models.user  # noqa: F401 - registers the users table for init_db
+        from app.core.database import SessionLocal, engine, init_db
+        from app.services.search_index import init_search_index
+
+        init_db()
+        init_search_index(engine)
+        db = SessionLocal()
+        try:
+            return index_documents(db, progress)
+        finally:
+            db.close()
+
+    if not args.directory.is_dir():
+        parser.error(f"{args.directory} is not a directory")
+    try:
+        jurisdiction = load_jurisdiction(args.jurisdiction)
+    except FileNotFoundError as e:
+        parser.error(str(e))
+    except (OSError, ValueError) as e:
+        parser.error(f"Could not read jurisdiction '{args.jurisdiction}': {e}")
+    errors = validate_jurisdiction(jurisdiction)
+    if errors:
+        parser.error("Invalid jurisdiction: " + "; ".join(errors))
+    manifest = None
+    if args.manifest:
+        try:
+            manifest = json.loads(args.manifest.read_text())
+        except (OSError, ValueError) as e:
+            parser.error(f"Could not read manifest {args.manifest}: {e}")
+        if not isinstance(manifest, dict):
+            parser.error("--manifest must be a JSON object of {\"file name\": \"checklist item id\"}")
+    if args.pattern:
+        try:
+            pattern = re.compile(args.pattern)
+        except re.error as e:
+            parser.error(f"Invalid --pattern: {e}")
+        if "item" not in pattern.groupindex:
+            parser.error("--pattern needs a named group, e.g. '^(?P<item>[a-z-]+)_'")
+
+    out = args.output.open("w") if args.output else sys.stdout
+    try:
+        return validate_directory(
+            args.directory, jurisdiction, manifest, args.pattern, args.workers, out, progress
+        )
+    finally:
+        if args.output:
+            out.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from typing import Dict
+from fastapi import HTTPException, status
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.getenv(name, str(default)))
+
+def _env_float(name: str, default: float) -> float:
+    return float(os.getenv(name, str(default)))
+
+
+class AdmissionLimiter:
+    """
+    Concurrency limit with a bounded wait queue for one class of expensive work
+
+    At most max_concurrent callers run at once and at most max_queue wait for
+    a slot. A caller that finds the queue full gets 429; one that waits longer
+    than queue_timeout seconds gets 503. Both carry a Retry-After header.
+    Waiting happens on the event loop, so queued requests hold no threadpool
+    thread; all methods must be called from the event loop.
+    """
+
+    def __init__(self, name: str, max_concurrent: int, max_queue: int, queue_timeout: float, retry_after: int):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self._slots = asyncio.Semaphore(max_concurrent)
+        self.in_flight = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected_queue_full = 0
+        self.rejected_timeout = 0
+
+    def _reject(self, status_code: int, reason: str):
+        raise HTTPException(
+            status_code=status_code,
+            detail=f"Server is busy with {self.name} work ({reason}), please retry shortly",
+            headers={"Retry-After": str(self.retry_after)}
+        )
+
+    async def acquire(self):
+        """Take a slot, waiting in the bounded queue if needed; raises HTTPException when rejected"""
+        # locked() is also true while others are queued, so newcomers can't jump the queue
+        if self._slots.locked():
+            if self.waiting >= self.max_queue:
+                self.rejected_queue_full += 1
+                self._reject(status.HTTP_429_TOO_MANY_REQUESTS, "queue full")
+
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(self._slots.acquire(), self.queue_timeout)
+            except asyncio.TimeoutError:
+                self.rejected_timeout += 1
+                self._reject(status.HTTP_503_SERVICE_UNAVAILABLE, "timed out waiting")
+            finally:
+                self.waiting -= 1
+        else:
+            await self._slots.acquire()
+
+        self.in_flight += 1
+        self.admitted += 1
+
+    def release(self):
+        self.in_flight -= 1
+        self._slots.release()
+
+    @asynccontextmanager
+    async def slot(self):
+        await self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def stats(self) -> Dict:
+        return {
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "queue_timeout": self.queue_timeout,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "admitted": self.admitted,
+            "rejected_queue_full": self.rejected_queue_full,
+            "rejected_timeout": self.rejected_timeout,
+            "rejected": self.rejected_queue_full + self.rejected_timeout,
+        }
+
+
+def _limiter_from_env(name: str, default_concurrency: int) -> AdmissionLimiter:
+    prefix = f"ADMISSION_{name.upper()}"
+    concurrency = _env_int(f"{prefix}_CONCURRENCY", default_concurrency)
+    return AdmissionLimiter(
+        name=name,
+        max_concurrent=concurrency,
+        max_queue=_env_int(f"{prefix}_QUEUE", concurrency * 4),
+        queue_timeout=_env_float(f"{prefix}_TIMEOUT", 30),
+        retry_after=_env_int(f"{prefix}_RETRY_AFTER", 5),
+    )
+
+
+_cpus = os.cpu_count() or 1
+
+# One limiter per class of CPU-bound work
+validation_limiter = _limiter_from_env("validation", _cpus)
+report_limiter = _limiter_from_env("report", _cpus)
+hashing_limiter = _limiter_from_env("hashing", _cpus * 2)
+
+LIMITERS = {limiter.name: limiter for limiter in (validation_limiter, report_limiter, hashing_limiter)}
+
+
+def admit(limiter: AdmissionLimiter):
+    """
+    FastAPI dependency that holds a slot of `limiter` for the whole request
+
+    It is an async generator, so a queued request waits on the event loop
+    instead of tying up one of the threadpool's threads, which the admitted
+    requests and every sync endpoint need to make progress.
+    """
+    async def dependency():
+        async with limiter.slot():
+            yield
+    return dependency
+
+
+def admission_stats() -> Dict[str, Dict]:
+    return {name: limiter.stats() for name, limiter in LIMITERS.items()}
@@ -1,6 +1,7 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.schema import CreateTable
 import os
 
 # For now, use SQLite for simplicity
@@ -25,3 +26,82 @@ def get_db():
 
 def init_db():
     Base.metadata.create_all(bind=engine)
+    _add_missing_columns()
+    _add_missing_autoincrement()
+    _add_missing_indexes()
+
+def _add_missing_columns():
+    """create_all never alters existing tables, so add new columns that have a literal server default"""
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing or column.server_default is None:
+                    continue
+                if not isinstance(column.server_default.arg, str):
+                    continue
+                column_type = column.type.compile(dialect=engine.dialect)
+                not_null = "" if column.nullable else " NOT NULL"
+                conn.execute(text(
+                    f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}{not_null} "
+                    f"DEFAULT '{column.server_default.arg}'"
+                ))
+
+def _add_missing_autoincrement():
+    """
+    Rebuild SQLite tables declared sqlite_autoincrement after they were created
+
+    Without AUTOINCREMENT SQLite hands out the id of the most recently deleted
+    row again. The table is copied into a new one and swapped in; indexes are
+    recreated by _add_missing_indexes. The rebuild holds the write lock from
+    the start and re-checks the schema under it, so workers starting together
+    migrate once. The new sequence starts above any id still in use on disk,
+    since rows deleted before the migration left no other trace.
+    """
+    if engine.dialect.name != "sqlite":
+        return
+    tables = [table for table in Base.metadata.sorted_tables if table.dialect_options["sqlite"]["autoincrement"]]
+    with engine.connect() as conn:
+        pending = [table for table in tables if _needs_autoincrement(conn, table.name)]
+    if not pending:
+        return
+
+    # Imported here: storage depends on this module
+    from app.services.storage import highest_project_dir_id
+
+    with engine.connect() as conn:
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+        for table in pending:
+            if not _needs_autoincrement(conn, table.name):
+                continue
+            rebuilt = f"_{table.name}_rebuild"
+            columns = ", ".join(column.name for column in table.columns)
+            create = str(CreateTable(table).compile(dialect=engine.dialect))
+            conn.execute(text(create.replace(f"CREATE TABLE {table.name} ", f"CREATE TABLE {rebuilt} ", 1)))
+            conn.execute(text(f"INSERT INTO {rebuilt} ({columns}) SELECT {columns} FROM {table.name}"))
+            # Dropping before renaming keeps other tables' foreign keys pointing at the name
+            conn.execute(text(f"DROP TABLE {table.name}"))
+            conn.execute(text(f"ALTER TABLE {rebuilt} RENAME TO {table.name}"))
+            floor = highest_project_dir_id() if table.name == "projects" else 0
+            conn.execute(text("DELETE FROM sqlite_sequence WHERE name = :name"), {"name": table.name})
+            conn.execute(
+                text(f"INSERT INTO sqlite_sequence (name, seq) SELECT :name, MAX(COALESCE(MAX(id), 0), :floor) FROM {table.name}"),
+                {"name": table.name, "floor": floor}
+            )
+        conn.commit()
+
+def _needs_autoincrement(conn, table_name):
+    created = conn.execute(
+        text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": table_name}
+    ).scalar()
+    return created is not None and "AUTOINCREMENT" not in created.upper()
+
+def _add_missing_indexes():
+    """Likewise create indexes declared after a table already existed"""
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=conn, checkfirst=True)
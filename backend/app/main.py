@@ -1,9 +1,26 @@
 from fastapi import FastAPI
+import asyncio
 from fastapi.middleware.cors import CORSMiddleware
-from app.core.database import init_db
-from app.api.routes import projects, documents, auth
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+import os
+from app.core.database import init_db, engine
+from app.api.routes import projects, documents, auth, search, admin, jurisdictions
+from app.services.engines import schedule_preload
+from app.services.jurisdictions import JURISDICTION_WATCH, jurisdiction_registry, watch_jurisdictions
+from app.services.search_index import init_search_index
 
-app = FastAPI(title="Permit Readiness API", version="0.1.0")
+# Responses smaller than this many bytes are not worth compressing
+GZIP_MINIMUM_SIZE = int(os.getenv("GZIP_MINIMUM_SIZE", "1024"))
+GZIP_COMPRESS_LEVEL = int(os.getenv("GZIP_COMPRESS_LEVEL", "6"))
+
+app = FastAPI(
+    title="Permit Readiness API",
+    version="0.1.0",
+    default_response_class=ORJSONResponse
+)
+
+app.add_middleware(GZipMiddleware, minimum_size=GZIP_MINIMUM_SIZE, compresslevel=GZIP_COMPRESS_LEVEL)
 
 # CORS middleware for frontend
 app.add_middleware(
@@ -18,11 +35,33 @@ app.add_middleware(
 @app.on_event("startup")
 def on_startup():
     init_db()
+    init_search_index(engine)
+    schedule_preload()
+    jurisdiction_registry.load_all()
+
+jurisdiction_watch_stop = asyncio.Event()
+
+@app.on_event("startup")
+async def start_jurisdiction_watcher():
+    if JURISDICTION_WATCH:
+        app.state.jurisdiction_watcher = asyncio.create_task(
+            watch_jurisdictions(jurisdiction_registry, jurisdiction_watch_stop)
+        )
+
+@app.on_event("shutdown")
+async def stop_jurisdiction_watcher():
+    watcher = getattr(app.state, "jurisdiction_watcher", None)
+    if watcher is not None:
+        jurisdiction_watch_stop.set()
+        await watcher
 
 # Include routers
 app.include_router(auth.router, prefix="/api/auth", tags=["auth"])
 app.include_router(projects.router, prefix="/api/projects", tags=["projects"])
 app.include_router(documents.router, prefix="/api/documents", tags=["documents"])
+app.include_router(jurisdictions.router, prefix="/api/jurisdictions", tags=["jurisdictions"])
+app.include_router(search.router, prefix="/api/search", tags=["search"])
+app.include_router(admin.router, prefix="/api/admin", tags=["admin"])
 
 @app.get("/")
 def read_root():
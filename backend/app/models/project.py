@@ -5,26 +5,33 @@ from app.core.database import Base
 
 class Project(Base):
     __tablename__ = "projects"
+    # Never reuse the id of a deleted project: uploads/<id>/ and cached
+    # per-project state are keyed by it
+    __table_args__ = {"sqlite_autoincrement": True}
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
     jurisdiction = Column(String, nullable=False)
     jurisdiction_data = Column(JSON)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    # Bumped on every checklist edit; clients send it back for optimistic concurrency
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     # Relationships
+    # passive_deletes: rows are removed set-based (app.services.storage) or by
+    # ON DELETE CASCADE, never loaded into memory just to be deleted
     user = relationship("User", back_populates="projects")
-    documents = relationship("Document", back_populates="project", cascade="all, delete-orphan")
-    validations = relationship("ValidationResult", back_populates="project", cascade="all, delete-orphan")
+    documents = relationship("Document", back_populates="project", cascade="all, delete-orphan", passive_deletes=True)
+    validations = relationship("ValidationResult", back_populates="project", cascade="all, delete-orphan", passive_deletes=True)
 
 
 class Document(Base):
     __tablename__ = "documents"
 
     id = Column(Integer, primary_key=True, index=True)
-    project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False, index=True)
     checklist_item_id = Column(String, nullable=False)
     filename = Column(String, nullable=False)
     file_path = Column(String, nullable=False)
@@ -34,13 +41,27 @@ class Document(Base):
     
     # Relationships
     project = relationship("Project", back_populates="documents")
+    text = relationship("DocumentText", back_populates="document", uselist=False, cascade="all, delete-orphan", passive_deletes=True)
+
+
+class DocumentText(Base):
+    """Text extracted from a document at validation time, kept for full-text search"""
+    __tablename__ = "document_texts"
+
+    document_id = Column(Integer, ForeignKey("documents.id", ondelete="CASCADE"), primary_key=True)
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False, index=True)
+    content = Column(Text, nullable=False)
+    indexed_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    # Relationships
+    document = relationship("Document", back_populates="text")
 
 
 class ValidationResult(Base):
     __tablename__ = "validation_results"
 
     id = Column(Integer, primary_key=True, index=True)
-    project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False, index=True)
     checklist_item_id = Column(String, nullable=False)
     status = Column(String)
     notes = Column(Text)
@@ -48,3 +69,23 @@ class ValidationResult(Base):
     
     # Relationships
     project = relationship("Project", back_populates="validations")
+    evidence = relationship("ValidationEvidence", back_populates="validation", cascade="all, delete-orphan", passive_deletes=True)
+
+
+class ValidationEvidence(Base):
+    """Where a validation rule matched: one row per rule, term and location"""
+    __tablename__ = "validation_evidence"
+
+    id = Column(Integer, primary_key=True)
+    validation_id = Column(Integer, ForeignKey("validation_results.id", ondelete="CASCADE"), nullable=False, index=True)
+    document_id = Column(Integer, ForeignKey("documents.id", ondelete="CASCADE"), nullable=False, index=True)
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False, index=True)
+    rule = Column(String, nullable=False)
+    term = Column(String)
+    # 1-based page number; start/end are character offsets within that page's extracted text
+    page = Column(Integer)
+    start = Column(Integer, nullable=False)
+    end = Column(Integer, nullable=False)
+    
+    # Relationships
+    validation = relationship("ValidationResult", back_populates="evidence")
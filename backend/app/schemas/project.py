@@ -1,6 +1,6 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, model_validator
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Literal
 
 class DocumentBase(BaseModel):
     checklist_item_id: str
@@ -26,10 +26,14 @@ class ProjectBase(BaseModel):
     jurisdiction: str
 
 class ProjectCreate(ProjectBase):
+    # When set, the checklist comes from the server's jurisdiction catalog
+    jurisdiction_id: Optional[str] = None
+    # Legacy fallback for clients that still post the whole definition
     jurisdiction_data: Optional[Dict[str, Any]] = None
 
 class Project(ProjectBase):
     id: int
+    version: int = 1
     jurisdiction_data: Optional[Dict[str, Any]]
     created_at: datetime
     updated_at: Optional[datetime]
@@ -49,3 +53,36 @@ class ProjectSummary(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class ProjectBulkDelete(BaseModel):
+    project_ids: Optional[List[int]] = None
+    created_before: Optional[datetime] = None
+
+    @model_validator(mode="after")
+    def check_selector(self):
+        if self.project_ids is None and self.created_before is None:
+            raise ValueError("Provide project_ids, created_before, or both")
+        return self
+
+
+class ChecklistOperation(BaseModel):
+    op: Literal["add", "remove", "update"]
+    item: Optional[Dict[str, Any]] = None      # add: the new custom item, must include "id"
+    item_id: Optional[str] = None              # remove / update: the custom item to change
+    changes: Optional[Dict[str, Any]] = None   # update: fields to overwrite
+
+    @model_validator(mode="after")
+    def check_arguments(self):
+        if self.op == "add" and not (self.item and self.item.get("id")):
+            raise ValueError("add needs an item with an id")
+        if self.op in ("remove", "update") and not self.item_id:
+            raise ValueError(f"{self.op} needs an item_id")
+        if self.op == "update" and not self.changes:
+            raise ValueError("update needs changes")
+        return self
+
+
+class ChecklistPatch(BaseModel):
+    version: int
+    operations: List[ChecklistOperation]
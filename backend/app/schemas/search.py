@@ -0,0 +1,11 @@
+from pydantic import BaseModel
+from typing import Optional
+
+class SearchHit(BaseModel):
+    document_id: int
+    project_id: int
+    project_name: str
+    checklist_item_id: str
+    filename: str
+    rank: Optional[float]
+    snippet: Optional[str]
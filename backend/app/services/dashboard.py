@@ -0,0 +1,161 @@
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict
+from sqlalchemy import text as sql
+from sqlalchemy.orm import Session
+
+# Seconds a user's dashboard is served from memory before it is recomputed
+DASHBOARD_CACHE_TTL = float(os.getenv("DASHBOARD_CACHE_TTL", "30"))
+DASHBOARD_TOP_MISSING = int(os.getenv("DASHBOARD_TOP_MISSING", "10"))
+
+# How each dialect unpacks the checklist array in projects.jurisdiction_data
+SQLITE_JSON = {
+    "items": "json_each(p.jurisdiction_data, '$.checklist') item",
+    "item_id": "json_extract(item.value, '$.id')",
+    "item_name": "json_extract(item.value, '$.name')",
+    "required": "json_extract(item.value, '$.required') = 1",
+}
+
+POSTGRES_JSON = {
+    "items": "json_array_elements(p.jurisdiction_data -> 'checklist') AS item(value)",
+    "item_id": "(item.value ->> 'id')",
+    "item_name": "(item.value ->> 'name')",
+    "required": "item.value ->> 'required' = 'true'",
+}
+
+SQLITE_SECONDS = "(julianday({end}) - julianday({start})) * 86400.0"
+POSTGRES_SECONDS = "EXTRACT(EPOCH FROM ({end} - {start}))"
+
+# A project is ready once every required item has a document (as in
+# compute_progress); it became ready when the last of them was first uploaded,
+# or when it was created if it has no required items.
+# The first upload is a correlated lookup on the documents.project_id index,
+# and per-project totals come from one GROUP BY rather than joining derived
+# tables, which keeps this linear in the number of projects.
+DASHBOARD_CTES = """
+WITH user_projects AS (
+    SELECT id, jurisdiction, created_at, jurisdiction_data FROM projects WHERE user_id = :user_id
+),
+coverage AS (
+    SELECT p.id AS project_id, p.jurisdiction, p.created_at,
+           {item_id} AS item_id, {item_name} AS item_name,
+           (SELECT MIN(d.uploaded_at) FROM documents d
+            WHERE d.project_id = p.id AND d.checklist_item_id = {item_id}) AS uploaded_at
+    FROM user_projects p, {items}
+    WHERE {required}
+),
+per_project AS (
+    SELECT project_id, jurisdiction, created_at,
+           COUNT(item_id) AS required_total,
+           COUNT(uploaded_at) AS required_uploaded,
+           MAX(uploaded_at) AS ready_at
+    FROM (
+        SELECT project_id, jurisdiction, created_at, item_id, uploaded_at FROM coverage
+        UNION ALL
+        -- One empty row per project so projects without required items still count
+        SELECT id, jurisdiction, created_at, NULL, NULL FROM user_projects
+    ) rows
+    GROUP BY project_id, jurisdiction, created_at
+),
+scored AS (
+    SELECT jurisdiction, created_at,
+           CASE WHEN required_total > 0 THEN ready_at ELSE created_at END AS ready_at,
+           CASE WHEN required_uploaded = required_total THEN 1 ELSE 0 END AS ready,
+           CASE WHEN required_total > 0 THEN 100.0 * required_uploaded / required_total ELSE 100 END AS completion
+    FROM per_project
+)
+"""
+
+# Both aggregates in one statement so the checklist JSON is unpacked once;
+# coverage is referenced twice, which makes the database materialize it
+DASHBOARD_QUERY = """
+SELECT 'jurisdiction' AS kind, jurisdiction AS key, NULL AS name, COUNT(*) AS projects,
+       SUM(ready) AS ready, SUM(completion) AS completion_sum,
+       SUM(CASE WHEN ready = 1 THEN {seconds} END) AS seconds_to_ready_sum
+FROM scored GROUP BY jurisdiction
+UNION ALL
+SELECT 'missing', item_id, item_name, COUNT(*), NULL, NULL, NULL
+FROM coverage WHERE uploaded_at IS NULL GROUP BY item_id, item_name
+"""
+
+
+def _average(total, count):
+    return round(float(total) / count, 1) if count and total is not None else None
+
+
+def dashboard_statement(dialect_name: str) -> str:
+    """The dashboard SQL for a dialect, taking a :user_id parameter"""
+    if dialect_name == "sqlite":
+        json_sql, seconds = SQLITE_JSON, SQLITE_SECONDS
+    else:
+        json_sql, seconds = POSTGRES_JSON, POSTGRES_SECONDS
+    return DASHBOARD_CTES.format(**json_sql) + DASHBOARD_QUERY.format(
+        seconds=seconds.format(end="ready_at", start="created_at")
+    )
+
+
+def compute_dashboard(db: Session, user_id: int) -> Dict:
+    """Portfolio aggregates over all of a user's projects, computed in the database"""
+    statement = dashboard_statement(db.bind.dialect.name)
+    rows = db.execute(sql(statement), {"user_id": user_id}).mappings().all()
+
+    jurisdictions = sorted(
+        (row for row in rows if row["kind"] == "jurisdiction"),
+        key=lambda row: (-row["projects"], row["key"])
+    )
+    missing = sorted(
+        (row for row in rows if row["kind"] == "missing"),
+        key=lambda row: (-row["projects"], row["key"])
+    )[:DASHBOARD_TOP_MISSING]
+
+    projects = sum(row["projects"] for row in jurisdictions)
+    ready = sum(row["ready"] for row in jurisdictions)
+    seconds_to_ready = sum(row["seconds_to_ready_sum"] or 0 for row in jurisdictions)
+    return {
+        "projects": projects,
+        "ready": ready,
+        "average_completion": _average(sum(row["completion_sum"] for row in jurisdictions), projects),
+        "average_days_to_ready": _average(seconds_to_ready / 86400, ready),
+        "by_jurisdiction": [
+            {
+                "jurisdiction": row["key"],
+                "projects": row["projects"],
+                "ready": row["ready"],
+                "average_completion": _average(row["completion_sum"], row["projects"]),
+            }
+            for row in jurisdictions
+        ],
+        "most_missing": [
+            {"item_id": row["key"], "item_name": row["name"], "missing_in": row["projects"]}
+            for row in missing
+        ],
+        "computed_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+class DashboardCache:
+    """Per-user results kept for DASHBOARD_CACHE_TTL seconds"""
+
+    def __init__(self, ttl: float = DASHBOARD_CACHE_TTL):
+        self.ttl = ttl
+        self._entries: Dict[int, tuple] = {}
+        self._lock = threading.Lock()
+
+    def get(self, db: Session, user_id: int) -> Dict:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+        if entry and entry[0] > now:
+            return entry[1]
+
+        dashboard = compute_dashboard(db, user_id)
+        with self._lock:
+            # Drop expired entries so the cache stays proportional to active users
+            self._entries = {key: value for key, value in self._entries.items() if value[0] > now}
+            self._entries[user_id] = (now + self.ttl, dashboard)
+        return dashboard
+
+
+dashboard_cache = DashboardCache()
@@ -0,0 +1,74 @@
+import importlib
+import os
+import sys
+import threading
+import time
+from types import ModuleType
+from typing import Dict, Iterable, Optional
+
+# Heavy modules the routes import on first use rather than at boot
+ENGINE_MODULES = {
+    "pdf": "app.services.pdf_parser",
+    "report": "app.services.report_generator",
+}
+
+# When to load them: "lazy" (first request that needs them), "startup"
+# (before the worker accepts traffic) or "background" (in a thread after
+# ENGINE_PRELOAD_DELAY seconds, so the worker starts serving immediately)
+ENGINE_PRELOAD = os.getenv("ENGINE_PRELOAD", "lazy")
+ENGINE_PRELOAD_DELAY = float(os.getenv("ENGINE_PRELOAD_DELAY", "0"))
+
+# Seconds spent importing each engine in this process, for diagnostics
+import_timings: Dict[str, float] = {}
+
+
+def load_engine(name: str) -> ModuleType:
+    """
+    The engine's module, importing it on first use
+
+    Routes go through this rather than importing the module directly, so a
+    lazy first-use import is timed like a preload. A module that was already
+    imported (e.g. as a dependency of another) keeps its earlier timing.
+    """
+    module = ENGINE_MODULES[name]
+    if module in sys.modules:
+        return sys.modules[module]
+    start = time.perf_counter()
+    loaded = importlib.import_module(module)
+    import_timings.setdefault(name, time.perf_counter() - start)
+    return loaded
+
+
+def preload_engines(names: Optional[Iterable[str]] = None) -> Dict[str, float]:
+    """Import the named engines (default: all) and return the time each took"""
+    for name in names or ENGINE_MODULES:
+        load_engine(name)
+    return {name: import_timings.get(name) for name in names or ENGINE_MODULES}
+
+
+def engine_status() -> Dict:
+    """Preload mode, which engines are imported and how long importing each took"""
+    return {
+        "preload": ENGINE_PRELOAD,
+        "engines": {
+            name: {
+                "loaded": module in sys.modules,
+                # None until loaded, or when imported other than through load_engine
+                "import_seconds": import_timings.get(name),
+            }
+            for name, module in ENGINE_MODULES.items()
+        },
+    }
+
+
+def schedule_preload(mode: str = ENGINE_PRELOAD, delay: float = ENGINE_PRELOAD_DELAY):
+    """Preload engines according to ENGINE_PRELOAD; called from app startup"""
+    if mode == "startup":
+        preload_engines()
+    elif mode == "background":
+        def run():
+            time.sleep(delay)
+            preload_engines()
+        threading.Thread(target=run, name="engine-preload", daemon=True).start()
+    elif mode != "lazy":
+        print(f"Unknown ENGINE_PRELOAD mode '{mode}', loading engines lazily")
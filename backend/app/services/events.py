@@ -0,0 +1,75 @@
+import asyncio
+import threading
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, Set, Tuple
+
+# Events buffered per subscriber before new ones are dropped for that subscriber
+SUBSCRIBER_QUEUE_SIZE = 256
+
+
+class ProjectEventBroker:
+    """
+    In-process fan-out of per-project events to WebSocket subscribers
+
+    publish() is safe to call from the event loop or from worker threads
+    (validation runs in the threadpool); events are handed to each
+    subscriber's loop with call_soon_threadsafe.
+
+    Subscribers only see events published by the same process. Run the API
+    as a single worker process, or a client may miss events for uploads that
+    another worker handled.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers: Dict[int, Set[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = defaultdict(set)
+
+    def subscribe(self, project_id: int) -> asyncio.Queue:
+        """Register a queue for a project; must be called from the subscriber's event loop"""
+        queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        with self._lock:
+            self._subscribers[project_id].add((asyncio.get_running_loop(), queue))
+        return queue
+
+    def unsubscribe(self, project_id: int, queue: asyncio.Queue):
+        with self._lock:
+            subscribers = self._subscribers.get(project_id, set())
+            subscribers.difference_update({entry for entry in subscribers if entry[1] is queue})
+            if not subscribers:
+                self._subscribers.pop(project_id, None)
+
+    def has_subscribers(self, project_id: int) -> bool:
+        with self._lock:
+            return bool(self._subscribers.get(project_id))
+
+    def publish(self, project_id: int, event_type: str, **data):
+        """Send an event to everyone watching a project"""
+        with self._lock:
+            subscribers = list(self._subscribers.get(project_id, ()))
+        if not subscribers:
+            return
+
+        event = {
+            'type': event_type,
+            'project_id': project_id,
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            **data,
+        }
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(_offer, queue, event)
+            except RuntimeError:
+                # Subscriber's loop already closed; it will unsubscribe on its way out
+                pass
+
+
+def _offer(queue: asyncio.Queue, event: Dict):
+    try:
+        queue.put_nowait(event)
+    except asyncio.QueueFull:
+        # A stalled client should not grow memory without bound
+        pass
+
+
+event_broker = ProjectEventBroker()
@@ -0,0 +1,249 @@
+import asyncio
+import brotli
+import gzip
+import hashlib
+import json
+import os
+import threading
+import orjson
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+JURISDICTIONS_DIR = Path(os.getenv(
+    "JURISDICTIONS_DIR",
+    str(Path(__file__).resolve().parents[3] / "data" / "jurisdictions")
+))
+# Set to 0 to load jurisdictions once at startup without watching for changes
+JURISDICTION_WATCH = os.getenv("JURISDICTION_WATCH", "1") == "1"
+
+# Fields in the slim catalog listing
+SLIM_FIELDS = ("id", "name", "state", "version")
+
+# validationRules keys PDFParser.validate_document understands, with their types
+RULE_TYPES = {
+    "minPages": int,
+    "requiredKeywords": list,
+    "mustContainSignature": bool,
+    "mustBeProfessionallySealed": bool,
+}
+
+
+def validate_jurisdiction(data) -> List[str]:
+    """Return a list of problems with a jurisdiction definition (empty if valid)"""
+    if not isinstance(data, dict):
+        return ["Top level must be an object"]
+
+    errors = []
+    info = data.get("jurisdiction")
+    if not isinstance(info, dict) or not info.get("id") or not info.get("name"):
+        errors.append("jurisdiction must be an object with id and name")
+    if not isinstance(data.get("version"), str) or not data.get("version"):
+        errors.append("version must be a non-empty string")
+
+    checklist = data.get("checklist")
+    if not isinstance(checklist, list) or not checklist:
+        errors.append("checklist must be a non-empty list")
+        return errors
+
+    seen = set()
+    for index, item in enumerate(checklist):
+        where = f"checklist[{index}]"
+        if not isinstance(item, dict):
+            errors.append(f"{where} must be an object")
+            continue
+        item_id = item.get("id")
+        if not isinstance(item_id, str) or not item_id:
+            errors.append(f"{where} needs a string id")
+        elif item_id in seen:
+            errors.append(f"{where} duplicates id '{item_id}'")
+        seen.add(item_id)
+        if not isinstance(item.get("name"), str):
+            errors.append(f"{where} needs a string name")
+        if "required" in item and not isinstance(item["required"], bool):
+            errors.append(f"{where}.required must be true or false")
+
+        rules = item.get("validationRules", {})
+        if not isinstance(rules, dict):
+            errors.append(f"{where}.validationRules must be an object")
+            continue
+        for rule, value in rules.items():
+            expected = RULE_TYPES.get(rule)
+            if expected is None:
+                errors.append(f"{where}.validationRules has unknown rule '{rule}'")
+            elif not isinstance(value, expected) or (expected is int and isinstance(value, bool)):
+                errors.append(f"{where}.validationRules.{rule} must be {expected.__name__}")
+            elif rule == "requiredKeywords" and not all(isinstance(k, str) and k for k in value):
+                errors.append(f"{where}.validationRules.requiredKeywords must be non-empty strings")
+    return errors
+
+
+class EncodedPayload:
+    """A JSON body serialized and compressed once, with a strong ETag"""
+
+    def __init__(self, payload):
+        body = orjson.dumps(payload)
+        self.etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        self.bodies = {
+            "identity": body,
+            "gzip": gzip.compress(body, compresslevel=9, mtime=0),
+            "br": brotli.compress(body),
+        }
+
+    def choose(self, accept_encoding: str):
+        """Pick the smallest encoding the client accepts"""
+        accepted = {part.split(";")[0].strip() for part in accept_encoding.lower().split(",")}
+        for encoding in ("br", "gzip"):
+            if encoding in accepted:
+                return encoding, self.bodies[encoding]
+        return "identity", self.bodies["identity"]
+
+
+class CompiledJurisdiction:
+    """A validated jurisdiction with lookups precomputed for request-time use"""
+
+    def __init__(self, data: Dict, path: Path, raw: bytes):
+        self.data = data
+        self.path = path
+        self.id = data["jurisdiction"]["id"]
+        self.name = data["jurisdiction"]["name"]
+        self.state = data["jurisdiction"].get("state")
+        self.version = data["version"]
+        self.effective_date = data.get("effectiveDate")
+        self.last_updated = data.get("lastUpdated")
+        self.sha256 = hashlib.sha256(raw).hexdigest()
+        self.loaded_at = datetime.now(timezone.utc).isoformat()
+        self.required_ids = [item["id"] for item in data["checklist"] if item.get("required")]
+        self.encoded = EncodedPayload(data)
+
+    def summary(self) -> Dict:
+        return {
+            **self.data["jurisdiction"],
+            "version": self.version,
+            "effectiveDate": self.effective_date,
+            "lastUpdated": self.last_updated,
+            "itemCount": len(self.data["checklist"]),
+            "requiredCount": len(self.required_ids),
+        }
+
+    def describe(self) -> Dict:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "version": self.version,
+            "effectiveDate": self.effective_date,
+            "lastUpdated": self.last_updated,
+            "file": self.path.name,
+            "sha256": self.sha256,
+            "loaded_at": self.loaded_at,
+        }
+
+
+class Catalog:
+    """One immutable generation of the registry, list responses included"""
+
+    def __init__(self, jurisdictions: Dict[str, CompiledJurisdiction]):
+        self.jurisdictions = jurisdictions
+        ordered = sorted(jurisdictions.values(), key=lambda jurisdiction: jurisdiction.name)
+        summaries = [jurisdiction.summary() for jurisdiction in ordered]
+        self.ordered = ordered
+        self.full = EncodedPayload(summaries)
+        self.slim = EncodedPayload([{field: summary.get(field) for field in SLIM_FIELDS} for summary in summaries])
+
+
+class JurisdictionRegistry:
+    """
+    The active set of jurisdictions, swapped atomically on reload
+
+    Readers take one reference to an immutable Catalog, so a reload never
+    blocks or half-updates a request. Serializing and compressing responses
+    happens while building the Catalog, off the request path. A file that
+    fails validation is recorded as rejected and the previously loaded rules
+    stay active.
+    """
+
+    def __init__(self, directory: Path = JURISDICTIONS_DIR):
+        self.directory = directory
+        self.catalog = Catalog({})
+        self._ids_by_file: Dict[str, str] = {}
+        self.rejected: Dict[str, Dict] = {}
+        self._write_lock = threading.Lock()
+
+    def get(self, jurisdiction_id: str) -> Optional[CompiledJurisdiction]:
+        return self.catalog.jurisdictions.get(jurisdiction_id)
+
+    def all(self) -> List[CompiledJurisdiction]:
+        return self.catalog.ordered
+
+    def load_all(self):
+        self.reload_files(sorted(self.directory.glob("*.json")))
+
+    def reload_files(self, paths: List[Path]):
+        """Validate and compile the given files, then swap them in together"""
+        compiled, removed = {}, []
+        for path in paths:
+            if not path.exists():
+                removed.append(path.name)
+                continue
+            result = self._compile(path)
+            if result is not None:
+                compiled[path.name] = result
+
+        with self._write_lock:
+            snapshot = dict(self.catalog.jurisdictions)
+            for file_name in removed:
+                old_id = self._ids_by_file.pop(file_name, None)
+                snapshot.pop(old_id, None)
+                self.rejected.pop(file_name, None)
+            for file_name, jurisdiction in compiled.items():
+                old_id = self._ids_by_file.get(file_name)
+                if old_id and old_id != jurisdiction.id:
+                    snapshot.pop(old_id, None)
+                snapshot[jurisdiction.id] = jurisdiction
+                self._ids_by_file[file_name] = jurisdiction.id
+                self.rejected.pop(file_name, None)
+            if compiled or removed:
+                self.catalog = Catalog(snapshot)
+
+    def _compile(self, path: Path) -> Optional[CompiledJurisdiction]:
+        try:
+            raw = path.read_bytes()
+            data = json.loads(raw)
+        except (OSError, ValueError) as e:
+            errors = [f"Could not read JSON: {e}"]
+        else:
+            errors = validate_jurisdiction(data)
+            if not errors:
+                return CompiledJurisdiction(data, path, raw)
+
+        active_id = self._ids_by_file.get(path.name)
+        active = self.get(active_id) if active_id else None
+        print(f"Rejected jurisdiction file {path.name}: {'; '.join(errors)}")
+        self.rejected[path.name] = {
+            "file": path.name,
+            "errors": errors,
+            "rejected_at": datetime.now(timezone.utc).isoformat(),
+            "active_version": active.version if active else None,
+        }
+        return None
+
+    def status(self) -> Dict:
+        return {
+            "directory": str(self.directory),
+            "active": [jurisdiction.describe() for jurisdiction in self.all()],
+            "rejected": list(self.rejected.values()),
+        }
+
+
+async def watch_jurisdictions(registry: JurisdictionRegistry, stop_event: asyncio.Event):
+    """Reload changed jurisdiction files until stop_event is set"""
+    from watchfiles import awatch
+
+    async for changes in awatch(registry.directory, stop_event=stop_event, recursive=False):
+        paths = sorted({Path(path) for _, path in changes if path.endswith(".json")})
+        if paths:
+            # Parsing and validation happen off the event loop
+            await asyncio.to_thread(registry.reload_files, paths)
+
+
+jurisdiction_registry = JurisdictionRegistry()
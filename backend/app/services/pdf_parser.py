@@ -1,23 +1,263 @@
 import PyPDF2
+import bisect
+import multiprocessing
+import os
 import re
-from typing import Dict, List, Optional
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, List, Optional, Set, Tuple
+from app.services.text_index import TextIndex, lower_keeping_offsets
+
+# Documents with at least this many pages are extracted across a process pool
+PARALLEL_PAGE_THRESHOLD = int(os.getenv("PDF_PARALLEL_PAGE_THRESHOLD", "300"))
+# Most worker processes a single document may occupy, so one huge upload
+# cannot starve extraction for everyone else
+MAX_WORKERS_PER_DOCUMENT = int(os.getenv("PDF_MAX_WORKERS_PER_DOCUMENT", "4"))
+# Size of the process pool shared by all documents
+EXTRACTION_POOL_SIZE = int(os.getenv("PDF_EXTRACTION_POOL_SIZE", str(os.cpu_count() or 1)))
+
+_extraction_pool = None
+_extraction_pool_lock = threading.Lock()
+
+def _get_extraction_pool() -> ProcessPoolExecutor:
+    global _extraction_pool
+    with _extraction_pool_lock:
+        if _extraction_pool is None:
+            # spawn rather than fork: the server process is multi-threaded
+            _extraction_pool = ProcessPoolExecutor(
+                max_workers=EXTRACTION_POOL_SIZE,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _extraction_pool
+
+def _discard_extraction_pool(pool: ProcessPoolExecutor):
+    """Forget a broken pool so the next caller builds a fresh one"""
+    global _extraction_pool
+    with _extraction_pool_lock:
+        # Another thread may already have replaced it
+        if _extraction_pool is pool:
+            _extraction_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+def _extract_page_range(file_path: str, start: int, stop: int, skip: Set[int] = frozenset()) -> List[str]:
+    """Extract text for pages [start, stop), leaving skipped pages empty; runs inside a pool worker"""
+    with open(file_path, 'rb') as file:
+        pdf_reader = PyPDF2.PdfReader(file)
+        return ["" if i in skip else pdf_reader.pages[i].extract_text() for i in range(start, stop)]
+
+# Page kinds from PDFParser.scan_pages; only these have a text layer worth
+# extracting. 'unknown' pages could not be scanned, so they are extracted anyway.
+TEXT_PAGE_KINDS = ("text", "mixed", "unknown")
+PAGE_KINDS = ("text", "mixed", "image", "blank", "unknown")
+# Text-showing operators (Tj, TJ, ', ") following a string or array operand
+TEXT_SHOW_OPERATOR = re.compile(rb"[)\]>]\s*(?:Tj|TJ|'|\")")
+XOBJECT_DO = re.compile(rb"/([^\s/\[\]()<>{}%]+)\s*Do\b")
+INLINE_IMAGE = re.compile(rb"(?:^|\s)BI\s")
+# Form XObjects can nest; don't follow pathological or cyclic nesting forever
+MAX_FORM_DEPTH = 5
+
+def _page_content(page) -> bytes:
+    """A page's content bytes; /Contents may be a single stream or an array of streams"""
+    contents = page.get("/Contents")
+    if contents is None:
+        return b""
+    contents = contents.get_object()
+    if isinstance(contents, PyPDF2.generic.ArrayObject):
+        # The streams are concatenated in order, as a viewer would; the newline
+        # keeps an operator split across two streams from fusing with the next
+        return b"\n".join(part.get_object().get_data() for part in contents)
+    return contents.get_data()
+
+def _scan_content(data: bytes, resources, depth: int, seen: Set) -> Tuple[bool, bool]:
+    """(has_text, has_image) for a content stream, looking into the XObjects it draws"""
+    has_text = bool(TEXT_SHOW_OPERATOR.search(data))
+    has_image = bool(INLINE_IMAGE.search(data))
+    names = set(XOBJECT_DO.findall(data))
+    if not names or resources is None:
+        return has_text, has_image
+    
+    xobjects = resources.get_object().get("/XObject")
+    xobjects = xobjects.get_object() if xobjects is not None else {}
+    for name in names:
+        if has_text and has_image:
+            break
+        reference = xobjects.get("/" + name.decode("latin-1"))
+        if reference is None:
+            continue
+        xobject = reference.get_object()
+        subtype = xobject.get("/Subtype")
+        if subtype == "/Image":
+            has_image = True
+        elif subtype == "/Form" and depth < MAX_FORM_DEPTH:
+            key = getattr(reference, "idnum", None)
+            if key is not None and key in seen:
+                continue
+            seen.add(key)
+            form_resources = xobject.get("/Resources", resources)
+            form_text, form_image = _scan_content(xobject.get_data(), form_resources, depth + 1, seen)
+            has_text = has_text or form_text
+            has_image = has_image or form_image
+    return has_text, has_image
+
+SIGNATURE_INDICATORS = [
+    'signed', 'signature', 'authorized by', 'approved by',
+    'digitally signed', 'electronically signed', '/s/'
+]
+
+SEAL_PATTERNS = [
+    r'\bP\.?E\.?\b',  # Professional Engineer
+    r'\bR\.?A\.?\b',  # Registered Architect
+    r'\bP\.?E\.?N\.?G\.?\b',  # Professional Engineer
+    r'professional engineer',
+    r'registered architect',
+    r'licensed engineer',
+    r'license no',
+    r'registration no',
+    r'stamp'
+]
+
+def join_pages(pages: List[str]) -> str:
+    return "".join(page_text + "\n" for page_text in pages)
+
+def locate_pages(pages: List[str], matches: List[Dict]) -> List[Dict]:
+    """
+    Turn document-level {start, end} offsets into page numbers (1-based)
+    and offsets within that page's text, as laid out by join_pages
+    """
+    starts = []
+    position = 0
+    for page_text in pages:
+        starts.append(position)
+        position += len(page_text) + 1
+    located = []
+    for match in matches:
+        page_index = max(bisect.bisect_right(starts, match['start']) - 1, 0)
+        located.append({
+            **match,
+            'page': page_index + 1,
+            'start': match['start'] - starts[page_index],
+            'end': match['end'] - starts[page_index],
+        })
+    return located
 
 class PDFParser:
     """Service for parsing and validating PDF documents"""
     
     @staticmethod
-    def extract_text(file_path: str) -> str:
-        """Extract all text from a PDF file"""
+    def extract_text(file_path: str, max_workers: Optional[int] = None) -> str:
+        """Extract all text from a PDF file, one newline after each page"""
+        return join_pages(PDFParser.extract_pages(file_path, max_workers))
+    
+    @staticmethod
+    def extract_pages(
+        file_path: str,
+        max_workers: Optional[int] = None,
+        page_kinds: Optional[List[str]] = None
+    ) -> List[str]:
+        """
+        Extract the text of each page of a PDF file
+        
+        Documents of PARALLEL_PAGE_THRESHOLD pages or more are split into
+        contiguous page ranges extracted in a shared process pool, using at
+        most max_workers (default MAX_WORKERS_PER_DOCUMENT) processes.
+        Given page_kinds from scan_pages, pages without a text layer are
+        not extracted and come back as empty strings.
+        """
+        skip = set()
+        if page_kinds is not None:
+            skip = {index for index, kind in enumerate(page_kinds) if kind not in TEXT_PAGE_KINDS}
         try:
             with open(file_path, 'rb') as file:
                 pdf_reader = PyPDF2.PdfReader(file)
-                text = ""
-                for page in pdf_reader.pages:
-                    text += page.extract_text() + "\n"
-                return text
+                page_count = len(pdf_reader.pages)
+                
+                workers = min(max_workers or MAX_WORKERS_PER_DOCUMENT, EXTRACTION_POOL_SIZE)
+                if page_count - len(skip) >= PARALLEL_PAGE_THRESHOLD and workers > 1:
+                    pages = PDFParser._extract_pages_parallel(file_path, page_count, workers, skip)
+                    if pages is not None:
+                        return pages
+                
+                return [
+                    "" if index in skip else page.extract_text()
+                    for index, page in enumerate(pdf_reader.pages)
+                ]
         except Exception as e:
             print(f"Error extracting text from {file_path}: {e}")
-            return ""
+            return []
+    
+    @staticmethod
+    def _extract_pages_parallel(file_path: str, page_count: int, workers: int, skip: Set[int] = frozenset()) -> Optional[List[str]]:
+        """
+        Extract per-page text across the process pool, in page order; None on pool failure
+
+        A pool broken by a crashed worker is replaced and the document retried
+        once, so one crash doesn't disable parallel extraction until restart.
+        """
+        chunk_size = -(-page_count // workers)  # ceiling division
+        ranges = [(start, min(start + chunk_size, page_count)) for start in range(0, page_count, chunk_size)]
+        for attempt in range(2):
+            pool = None
+            try:
+                pool = _get_extraction_pool()
+                futures = [
+                    pool.submit(_extract_page_range, file_path, start, stop, {i for i in skip if start <= i < stop})
+                    for start, stop in ranges
+                ]
+                pages = []
+                for future in futures:
+                    pages.extend(future.result())
+                return pages
+            except BrokenProcessPool as e:
+                if pool is not None:
+                    _discard_extraction_pool(pool)
+                print(f"Extraction pool broke while processing {file_path} (attempt {attempt + 1}): {e}")
+            except Exception as e:
+                # Anything else should degrade to serial extraction, not fail validation
+                print(f"Parallel extraction failed for {file_path}, falling back to serial: {e}")
+                return None
+        print(f"Falling back to serial extraction for {file_path}")
+        return None
+    
+    @staticmethod
+    def scan_pages(file_path: str) -> Optional[List[str]]:
+        """
+        Classify each page as 'text', 'image', 'mixed' or 'blank' from its structure
+        
+        Only content streams and resources are inspected: text-showing
+        operators versus image XObjects and inline images, following Form
+        XObjects. Nothing is decoded into text, so this is far cheaper than
+        extraction. A page whose structure cannot be read is 'unknown'.
+        Returns None if the file itself cannot be opened.
+        """
+        try:
+            with open(file_path, 'rb') as file:
+                pdf_reader = PyPDF2.PdfReader(file)
+                kinds = []
+                for number, page in enumerate(pdf_reader.pages, start=1):
+                    try:
+                        has_text, has_image = _scan_content(_page_content(page), page.get("/Resources"), 0, set())
+                    except Exception as e:
+                        print(f"Error scanning page {number} of {file_path}: {e}")
+                        kinds.append("unknown")
+                        continue
+                    if has_text:
+                        kinds.append("mixed" if has_image else "text")
+                    else:
+                        kinds.append("image" if has_image else "blank")
+                return kinds
+        except Exception as e:
+            print(f"Error scanning {file_path}: {e}")
+            return None
+    
+    @staticmethod
+    def summarize_page_kinds(page_kinds: List[str]) -> Dict:
+        """Counts per page kind plus the 1-based numbers of pages without text"""
+        summary = {kind: page_kinds.count(kind) for kind in PAGE_KINDS}
+        summary['pages_without_text'] = [
+            index + 1 for index, kind in enumerate(page_kinds) if kind not in TEXT_PAGE_KINDS
+        ]
+        return summary
     
     @staticmethod
     def get_page_count(file_path: str) -> int:
@@ -32,50 +272,56 @@ class PDFParser:
     
     @staticmethod
     def check_keywords(text: str, keywords: List[str], case_sensitive: bool = False) -> Dict[str, bool]:
-        """Check if specific keywords exist in the text"""
-        results = {}
-        search_text = text if case_sensitive else text.lower()
-        
-        for keyword in keywords:
-            search_keyword = keyword if case_sensitive else keyword.lower()
-            results[keyword] = search_keyword in search_text
-        
-        return results
+        """Check if specific keywords exist in the text, tolerating line breaks and hyphenation"""
+        if case_sensitive:
+            return {keyword: keyword in text for keyword in keywords}
+        matches = TextIndex(text).match_keywords(keywords)
+        return {keyword: match is not None for keyword, match in matches.items()}
     
     @staticmethod
     def check_signature_present(text: str) -> bool:
         """Check if document appears to have signature-related text"""
-        signature_indicators = [
-            'signed', 'signature', 'authorized by', 'approved by',
-            'digitally signed', 'electronically signed', '/s/'
-        ]
-        
-        text_lower = text.lower()
-        return any(indicator in text_lower for indicator in signature_indicators)
+        return bool(PDFParser.find_signature_indicators(text))
+    
+    @staticmethod
+    def find_signature_indicators(text: str) -> List[Dict]:
+        """First occurrence of each signature indicator, with offsets"""
+        # Same length as text, unlike text.lower(), so offsets index the original
+        text_lower = lower_keeping_offsets(text)
+        found = []
+        for indicator in SIGNATURE_INDICATORS:
+            start = text_lower.find(indicator)
+            if start != -1:
+                found.append({'term': indicator, 'start': start, 'end': start + len(indicator)})
+        return found
     
     @staticmethod
     def check_professional_seal(text: str) -> bool:
         """Check if document mentions professional seals (PE, RA, etc.)"""
-        seal_patterns = [
-            r'\bP\.?E\.?\b',  # Professional Engineer
-            r'\bR\.?A\.?\b',  # Registered Architect
-            r'\bP\.?E\.?N\.?G\.?\b',  # Professional Engineer
-            r'professional engineer',
-            r'registered architect',
-            r'licensed engineer',
-            r'license no',
-            r'registration no',
-            r'stamp'
-        ]
-        
-        text_lower = text.lower()
-        for pattern in seal_patterns:
-            if re.search(pattern, text_lower):
-                return True
-        return False
+        return bool(PDFParser.find_professional_seal(text))
+    
+    @staticmethod
+    def find_professional_seal(text: str) -> List[Dict]:
+        """First match of each professional seal pattern, with offsets"""
+        # Matched case-sensitively against lowercased text, as the seal check
+        # always has been; the patterns rely on that
+        text_lower = lower_keeping_offsets(text)
+        found = []
+        for pattern in SEAL_PATTERNS:
+            match = re.search(pattern, text_lower)
+            if match:
+                found.append({'term': text[match.start():match.end()], 'start': match.start(), 'end': match.end()})
+        return found
     
     @staticmethod
-    def validate_document(file_path: str, validation_rules: Dict) -> Dict:
+    def validate_document(
+        file_path: str,
+        validation_rules: Dict,
+        on_rule: Optional[Callable[[str, bool, Dict], None]] = None,
+        text: Optional[str] = None,
+        pages: Optional[List[str]] = None,
+        page_kinds: Optional[List[str]] = None
+    ) -> Dict:
         """
         Validate a PDF document against a set of rules
         
@@ -86,26 +332,70 @@ class PDFParser:
             'mustContainSignature': True,
             'mustBeProfessionallySealed': True
         }
+        
+        on_rule, if given, is called as on_rule(rule, passed, details) after
+        each rule is checked so callers can report progress. Pass pages (or
+        text) when they have already been extracted to avoid parsing the PDF
+        twice, and page_kinds from scan_pages if it has already run.
+        Otherwise the PDF is scanned first and image-only pages are never
+        extracted; details['page_types'] carries the breakdown.
+        
+        results['evidence'] lists where each passing rule matched as
+        {rule, term, page, start, end}, offsets being within the page's text.
+        page is None when only text was given, since page boundaries are
+        unknown then.
         """
+        def report(rule: str, passed: bool, details: Dict):
+            if on_rule:
+                on_rule(rule, passed, details)
+        
         results = {
             'valid': True,
             'errors': [],
             'warnings': [],
-            'details': {}
+            'details': {},
+            'evidence': []
         }
+        evidence = []
         
-        # Extract text
-        text = PDFParser.extract_text(file_path)
-        if not text:
+        # Scan structure, then extract text from pages that have any
+        if pages is None and text is None:
+            if page_kinds is None:
+                page_kinds = PDFParser.scan_pages(file_path)
+            pages = PDFParser.extract_pages(file_path, page_kinds=page_kinds)
+        if text is None:
+            text = join_pages(pages)
+        
+        page_types = None
+        if page_kinds is not None:
+            page_types = PDFParser.summarize_page_kinds(page_kinds)
+            results['details']['page_types'] = page_types
+        
+        if not text.strip():
             results['valid'] = False
-            results['errors'].append('Could not extract text from PDF')
+            if page_types and page_types['image'] and not any(page_types[kind] for kind in TEXT_PAGE_KINDS):
+                results['errors'].append(
+                    f'Document appears to be scanned images only ({page_types["image"]} of '
+                    f'{len(page_kinds)} pages are images with no text layer); text checks were skipped'
+                )
+            else:
+                results['errors'].append('Could not extract text from PDF')
+            report('textExtraction', False, {'page_types': page_types} if page_types else {})
             return results
         
+        if page_types and page_types['image']:
+            image_pages = [index + 1 for index, kind in enumerate(page_kinds) if kind == 'image']
+            results['warnings'].append(
+                f'{len(image_pages)} page(s) are images with no text layer and were not checked: '
+                f'{", ".join(str(page) for page in image_pages[:20])}' + (' ...' if len(image_pages) > 20 else '')
+            )
+        
         results['details']['text_extracted'] = True
         results['details']['character_count'] = len(text)
+        report('textExtraction', True, {'character_count': len(text)})
         
         # Check page count
-        page_count = PDFParser.get_page_count(file_path)
+        page_count = len(pages) if pages is not None else PDFParser.get_page_count(file_path)
         results['details']['page_count'] = page_count
         
         if 'minPages' in validation_rules:
@@ -113,44 +403,66 @@ class PDFParser:
             if page_count < min_pages:
                 results['valid'] = False
                 results['errors'].append(f'Document has {page_count} pages, minimum required is {min_pages}')
+            report('minPages', page_count >= min_pages, {'page_count': page_count, 'min_pages': min_pages})
         
         # Check required keywords
         if 'requiredKeywords' in validation_rules:
             keywords = validation_rules['requiredKeywords']
-            keyword_results = PDFParser.check_keywords(text, keywords)
+            keyword_matches = TextIndex(text).match_keywords(keywords)
+            keyword_results = {kw: match is not None for kw, match in keyword_matches.items()}
+            # Where and why each found keyword matched (exact, line_break, hyphenation, ...)
+            found_matches = {kw: match for kw, match in keyword_matches.items() if match}
+            evidence.extend(
+                {'rule': 'requiredKeywords', 'term': kw, 'start': match['start'], 'end': match['end']}
+                for kw, match in found_matches.items()
+            )
             results['details']['keywords'] = keyword_results
+            results['details']['keyword_matches'] = found_matches
             
             missing_keywords = [kw for kw, found in keyword_results.items() if not found]
             if missing_keywords:
                 results['valid'] = False
                 results['errors'].append(f'Missing required keywords: {", ".join(missing_keywords)}')
+            report('requiredKeywords', not missing_keywords, {'keywords': keyword_results, 'keyword_matches': found_matches})
         
         # Check for signature
         if validation_rules.get('mustContainSignature', False):
-            has_signature = PDFParser.check_signature_present(text)
+            signature_matches = PDFParser.find_signature_indicators(text)
+            has_signature = bool(signature_matches)
+            evidence.extend({'rule': 'mustContainSignature', **match} for match in signature_matches)
             results['details']['has_signature'] = has_signature
             
             if not has_signature:
                 results['warnings'].append('No signature indicators found in document')
+            report('mustContainSignature', has_signature, {})
         
         # Check for professional seal
         if validation_rules.get('mustBeProfessionallySealed', False):
-            has_seal = PDFParser.check_professional_seal(text)
+            seal_matches = PDFParser.find_professional_seal(text)
+            has_seal = bool(seal_matches)
+            evidence.extend({'rule': 'mustBeProfessionallySealed', **match} for match in seal_matches)
             results['details']['has_professional_seal'] = has_seal
             
             if not has_seal:
                 results['warnings'].append('No professional seal indicators found in document')
+            report('mustBeProfessionallySealed', has_seal, {})
         
+        if pages is not None:
+            results['evidence'] = locate_pages(pages, evidence)
+        else:
+            results['evidence'] = [{**match, 'page': None} for match in evidence]
         return results
     
     @staticmethod
     def get_document_summary(file_path: str) -> Dict:
         """Get a summary of document contents"""
-        text = PDFParser.extract_text(file_path)
-        page_count = PDFParser.get_page_count(file_path)
+        page_kinds = PDFParser.scan_pages(file_path)
+        text = join_pages(PDFParser.extract_pages(file_path, page_kinds=page_kinds))
+        page_count = len(page_kinds) if page_kinds is not None else PDFParser.get_page_count(file_path)
         
         return {
             'page_count': page_count,
+            'page_types': PDFParser.summarize_page_kinds(page_kinds) if page_kinds is not None else None,
             'character_count': len(text),
             'word_count': len(text.split()),
             'has_signature': PDFParser.check_signature_present(text),
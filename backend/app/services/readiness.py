@@ -0,0 +1,218 @@
+import hashlib
+import html
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Tuple
+import orjson
+
+NEXT_STEPS_READY = [
+    "All documents are signed and sealed by licensed professionals where required",
+    "All forms are notarized as needed",
+    "You have reviewed all documents for accuracy",
+    "You have the required filing fees ready",
+]
+NEXT_STEPS_READY_INTRO = "Your submission package is complete and ready for official filing. Please ensure:"
+NEXT_STEPS_READY_OUTRO = "You may now proceed with submitting your application to the jurisdiction."
+
+NEXT_STEPS_INCOMPLETE = [
+    "Upload all missing required documents listed above",
+    "Ensure all documents meet the file format and size requirements",
+    "Verify all professional seals and signatures are included",
+    "Generate a new report once all documents are uploaded",
+]
+NEXT_STEPS_INCOMPLETE_INTRO = "Your submission package is incomplete. Please:"
+
+# Rendered readiness documents kept per project; an entry is reused while the
+# project's fingerprint (checklist version and documents) is unchanged
+READINESS_CACHE_SIZE = int(os.getenv("READINESS_CACHE_SIZE", "1024"))
+
+
+def compute_progress(checklist: List[Dict], documents) -> Dict:
+    """
+    Summarize how many required checklist items have an uploaded document
+
+    A checklist with no required items is complete: nothing is missing.
+    """
+    uploaded_ids = {doc.checklist_item_id for doc in documents}
+    required_ids = [item['id'] for item in checklist if item.get('required')]
+    uploaded_required = [item_id for item_id in required_ids if item_id in uploaded_ids]
+
+    completion = int((len(uploaded_required) / len(required_ids)) * 100) if required_ids else 100
+
+    return {
+        'required_total': len(required_ids),
+        'required_uploaded': len(uploaded_required),
+        'document_count': len(documents),
+        'completion_percentage': completion,
+        'ready': completion == 100,
+    }
+
+
+def readiness_fingerprint(project, documents) -> str:
+    """
+    Changes whenever anything shown in the readiness model could change
+
+    Needs only the project's id, version, name and jurisdiction, and each
+    document's id, checklist_item_id and filename, so callers can compute it
+    from narrow column queries. Checklist edits bump the project version.
+    """
+    parts = [str(project.id), str(project.version), project.name, project.jurisdiction]
+    parts.extend(f"{doc.id}:{doc.checklist_item_id}:{doc.filename}" for doc in documents)
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()[:32]
+
+
+def build_readiness(project, documents) -> Dict:
+    """
+    The readiness of a project as plain data
+
+    Shared by the JSON, HTML and PDF renderings: overall status, completion,
+    one row per checklist item, missing required items and next steps. It
+    holds nothing time-dependent, so a rendering can be cached for as long as
+    the project's fingerprint is unchanged.
+    """
+    checklist = (project.jurisdiction_data or {}).get('checklist', [])
+    progress = compute_progress(checklist, documents)
+
+    # The first document uploaded for each item is the one shown
+    uploaded: Dict[str, str] = {}
+    for doc in documents:
+        uploaded.setdefault(doc.checklist_item_id, doc.filename)
+
+    rows = [
+        {
+            'id': item['id'],
+            'name': item.get('name', 'Unknown Document'),
+            'category': item.get('category'),
+            'required': bool(item.get('required')),
+            'uploaded': item['id'] in uploaded,
+            'filename': uploaded.get(item['id']),
+        }
+        for item in checklist
+    ]
+    ready = progress['ready']
+
+    return {
+        'project': {
+            'id': project.id,
+            'name': project.name,
+            'jurisdiction': project.jurisdiction,
+            'created_at': project.created_at,
+            'version': project.version,
+        },
+        'status': 'ready' if ready else 'incomplete',
+        'ready': ready,
+        'completion_percentage': progress['completion_percentage'],
+        'required_total': progress['required_total'],
+        'required_uploaded': progress['required_uploaded'],
+        'optional_uploaded': len(documents) - progress['required_uploaded'],
+        'checklist': rows,
+        'missing_required': [
+            {'id': row['id'], 'name': row['name']} for row in rows if row['required'] and not row['uploaded']
+        ],
+        'next_steps': {
+            'intro': NEXT_STEPS_READY_INTRO if ready else NEXT_STEPS_INCOMPLETE_INTRO,
+            'steps': NEXT_STEPS_READY if ready else NEXT_STEPS_INCOMPLETE,
+            'outro': NEXT_STEPS_READY_OUTRO if ready else None,
+        },
+    }
+
+
+def render_readiness_json(readiness: Dict) -> bytes:
+    return orjson.dumps(readiness)
+
+
+def render_readiness_html(readiness: Dict) -> bytes:
+    """A self-contained HTML page for the in-app readiness screen"""
+    e = html.escape
+    project = readiness['project']
+    created = project['created_at'].strftime('%B %d, %Y') if project['created_at'] else ''
+    status_text = 'Ready for Submission' if readiness['ready'] else 'Incomplete'
+
+    rows = "".join(
+        f"<tr class=\"{'uploaded' if row['uploaded'] else 'missing' if row['required'] else 'optional'}\">"
+        f"<td>{'&#10003;' if row['uploaded'] else '&#10007;'}</td>"
+        f"<td>{e(row['name'])}</td>"
+        f"<td>{'Yes' if row['required'] else 'No'}</td>"
+        f"<td>{e(row['filename']) if row['filename'] else 'Not uploaded'}</td></tr>"
+        for row in readiness['checklist']
+    )
+    missing = ""
+    if readiness['missing_required']:
+        items = "".join(f"<li>{e(item['name'])}</li>" for item in readiness['missing_required'])
+        missing = f"<h2>Missing Required Documents</h2><ul>{items}</ul>"
+    next_steps = readiness['next_steps']
+    steps = "".join(f"<li>{e(step)}</li>" for step in next_steps['steps'])
+    outro = f"<p>{e(next_steps['outro'])}</p>" if next_steps['outro'] else ""
+
+    page = f"""<!DOCTYPE html>
+<html lang="en"><head><meta charset="utf-8"><title>Permit Readiness - {e(project['name'])}</title>
+<style>
+body{{font-family:system-ui,sans-serif;color:#1f2937;max-width:56rem;margin:2rem auto;padding:0 1rem}}
+h1{{color:#1e40af}} table{{border-collapse:collapse;width:100%}}
+td,th{{border:1px solid #d1d5db;padding:.5rem;text-align:left}} th{{background:#1e40af;color:#fff}}
+.ready{{color:#10b981}} .incomplete{{color:#ef4444}}
+tr.uploaded td:first-child{{color:#10b981}} tr.missing td:first-child{{color:#ef4444}} tr.optional td:first-child{{color:#6b7280}}
+</style></head><body>
+<h1>Permit Readiness Report</h1>
+<h2>Project Information</h2>
+<table>
+<tr><td>Project Name</td><td>{e(project['name'])}</td></tr>
+<tr><td>Jurisdiction</td><td>{e(project['jurisdiction'])}</td></tr>
+<tr><td>Created Date</td><td>{created}</td></tr>
+</table>
+<h2>Validation Status</h2>
+<table>
+<tr><td>Status</td><td class="{readiness['status']}"><strong>{status_text}</strong></td></tr>
+<tr><td>Completion</td><td>{readiness['completion_percentage']}%</td></tr>
+<tr><td>Required Documents</td><td>{readiness['required_uploaded']} of {readiness['required_total']} uploaded</td></tr>
+<tr><td>Optional Documents</td><td>{readiness['optional_uploaded']} uploaded</td></tr>
+</table>
+<h2>Document Checklist</h2>
+<table><tr><th>Status</th><th>Document Name</th><th>Required</th><th>Uploaded</th></tr>{rows}</table>
+{missing}
+<h2>Next Steps</h2>
+<p>{e(next_steps['intro'])}</p><ul>{steps}</ul>{outro}
+</body></html>
+"""
+    return page.encode()
+
+
+RENDERERS = {
+    'json': ('application/json', render_readiness_json),
+    'html': ('text/html', render_readiness_html),
+}
+
+
+class ReadinessCache:
+    """Rendered readiness per project, reused until the project's fingerprint changes"""
+
+    def __init__(self, max_entries: int = READINESS_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[int, str], Tuple[str, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def render(self, project_id: int, format: str, fingerprint: str,
+               load: Callable[[], Tuple[object, list]]) -> bytes:
+        """
+        The rendered body for a project in the given format
+
+        load returns (project, documents) and is only called when the cached
+        body was rendered from a different fingerprint.
+        """
+        key = (project_id, format)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] == fingerprint:
+                self._entries.move_to_end(key)
+                return entry[1]
+        body = RENDERERS[format][1](build_readiness(*load()))
+        with self._lock:
+            self._entries[key] = (fingerprint, body)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return body
+
+
+readiness_cache = ReadinessCache()
@@ -6,11 +6,16 @@ from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph,
 from reportlab.lib.enums import TA_CENTER, TA_LEFT
 from datetime import datetime
 import io
+from app.services.readiness import build_readiness
 
 def generate_readiness_report(project, documents):
     """
     Generate a PDF readiness report for a project
+    
+    The content comes from build_readiness, the same model behind the JSON and
+    HTML views; this only lays it out as a document.
     """
+    readiness = build_readiness(project, documents)
     buffer = io.BytesIO()
     doc = SimpleDocTemplate(buffer, pagesize=letter)
     story = []
@@ -67,27 +72,21 @@ def generate_readiness_report(project, documents):
     # Validation Status Section
     story.append(Paragraph("Validation Status", heading_style))
     
-    checklist = project.jurisdiction_data.get('checklist', [])
-    required_items = [item for item in checklist if item.get('required')]
-    uploaded_ids = [doc.checklist_item_id for doc in documents]
-    uploaded_required = [item for item in required_items if item['id'] in uploaded_ids]
-    
-    completion_percentage = int((len(uploaded_required) / len(required_items)) * 100) if required_items else 0
-    
-    status_color = colors.HexColor('#10b981') if completion_percentage == 100 else colors.HexColor('#ef4444')
-    status_text = "✓ READY FOR SUBMISSION" if completion_percentage == 100 else "✗ INCOMPLETE"
+    ready = readiness['ready']
+    status_color = colors.HexColor('#10b981') if ready else colors.HexColor('#ef4444')
+    status_text = "✓ READY FOR SUBMISSION" if ready else "✗ INCOMPLETE"
     
     status_data = [
         ['Status:', status_text],
-        ['Completion:', f'{completion_percentage}%'],
-        ['Required Documents:', f'{len(uploaded_required)} of {len(required_items)} uploaded'],
-        ['Optional Documents:', f'{len(documents) - len(uploaded_required)} uploaded'],
+        ['Completion:', f"{readiness['completion_percentage']}%"],
+        ['Required Documents:', f"{readiness['required_uploaded']} of {readiness['required_total']} uploaded"],
+        ['Optional Documents:', f"{readiness['optional_uploaded']} uploaded"],
     ]
     
     status_table = Table(status_data, colWidths=[2*inch, 4*inch])
     status_table.setStyle(TableStyle([
         ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#f3f4f6')),
-        ('BACKGROUND', (1, 0), (1, 0), colors.HexColor('#f0fdf4') if completion_percentage == 100 else colors.HexColor('#fef2f2')),
+        ('BACKGROUND', (1, 0), (1, 0), colors.HexColor('#f0fdf4') if ready else colors.HexColor('#fef2f2')),
         ('TEXTCOLOR', (1, 0), (1, 0), status_color),
         ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
         ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
@@ -107,21 +106,12 @@ def generate_readiness_report(project, documents):
     
     checklist_data = [['Status', 'Document Name', 'Required', 'Uploaded']]
     
-    for item in checklist:
-        status_icon = '✓' if item['id'] in uploaded_ids else '✗'
-        status_color_cell = colors.HexColor('#10b981') if item['id'] in uploaded_ids else (colors.HexColor('#ef4444') if item.get('required') else colors.grey)
-        
-        doc_name = item.get('name', 'Unknown Document')
-        required_text = 'Yes' if item.get('required') else 'No'
-        
-        uploaded_doc = next((doc for doc in documents if doc.checklist_item_id == item['id']), None)
-        uploaded_text = uploaded_doc.filename if uploaded_doc else 'Not uploaded'
-        
+    for row in readiness['checklist']:
         checklist_data.append([
-            status_icon,
-            doc_name,
-            required_text,
-            uploaded_text
+            '✓' if row['uploaded'] else '✗',
+            row['name'],
+            'Yes' if row['required'] else 'No',
+            row['filename'] or 'Not uploaded'
         ])
     
     checklist_table = Table(checklist_data, colWidths=[0.5*inch, 2.5*inch, 1*inch, 2*inch])
@@ -138,29 +128,26 @@ def generate_readiness_report(project, documents):
     ]))
     
     # Apply conditional formatting to status column
-    for i, item in enumerate(checklist, start=1):
-        if item['id'] in uploaded_ids:
-            checklist_table.setStyle(TableStyle([
-                ('TEXTCOLOR', (0, i), (0, i), colors.HexColor('#10b981')),
-                ('FONTNAME', (0, i), (0, i), 'Helvetica-Bold'),
-            ]))
+    for i, row in enumerate(readiness['checklist'], start=1):
+        if row['uploaded']:
+            color = colors.HexColor('#10b981')
         else:
-            color = colors.HexColor('#ef4444') if item.get('required') else colors.grey
-            checklist_table.setStyle(TableStyle([
-                ('TEXTCOLOR', (0, i), (0, i), color),
-                ('FONTNAME', (0, i), (0, i), 'Helvetica-Bold'),
-            ]))
+            color = colors.HexColor('#ef4444') if row['required'] else colors.grey
+        checklist_table.setStyle(TableStyle([
+            ('TEXTCOLOR', (0, i), (0, i), color),
+            ('FONTNAME', (0, i), (0, i), 'Helvetica-Bold'),
+        ]))
     
     story.append(checklist_table)
     story.append(Spacer(1, 0.4*inch))
     
     # Missing Documents Section (if any)
-    missing_required = [item for item in required_items if item['id'] not in uploaded_ids]
+    missing_required = readiness['missing_required']
     
     if missing_required:
         story.append(Paragraph("Missing Required Documents", heading_style))
         
-        missing_text = "<br/>".join([f"• {item.get('name')}" for item in missing_required])
+        missing_text = "<br/>".join([f"• {item['name']}" for item in missing_required])
         missing_para = Paragraph(missing_text, styles['Normal'])
         story.append(missing_para)
         story.append(Spacer(1, 0.3*inch))
@@ -168,26 +155,10 @@ def generate_readiness_report(project, documents):
     # Next Steps Section
     story.append(Paragraph("Next Steps", heading_style))
     
-    if completion_percentage == 100:
-        next_steps_text = """
-        Your submission package is complete and ready for official filing. Please ensure:
-        <br/><br/>
-        • All documents are signed and sealed by licensed professionals where required<br/>
-        • All forms are notarized as needed<br/>
-        • You have reviewed all documents for accuracy<br/>
-        • You have the required filing fees ready<br/>
-        <br/>
-        You may now proceed with submitting your application to the jurisdiction.
-        """
-    else:
-        next_steps_text = """
-        Your submission package is incomplete. Please:
-        <br/><br/>
-        • Upload all missing required documents listed above<br/>
-        • Ensure all documents meet the file format and size requirements<br/>
-        • Verify all professional seals and signatures are included<br/>
-        • Generate a new report once all documents are uploaded<br/>
-        """
+    next_steps = readiness['next_steps']
+    next_steps_text = next_steps['intro'] + "<br/><br/>" + "".join(f"• {step}<br/>" for step in next_steps['steps'])
+    if next_steps['outro']:
+        next_steps_text += "<br/>" + next_steps['outro']
     
     next_steps_para = Paragraph(next_steps_text, styles['Normal'])
     story.append(next_steps_para)
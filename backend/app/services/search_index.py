@@ -0,0 +1,197 @@
+import re
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import text as sql
+from sqlalchemy.orm import Session
+from app.models.project import Document, DocumentText
+
+FTS_TABLE = "document_text_fts"
+
+# SQLite: an external-content FTS5 table over document_texts, kept in sync by
+# triggers so the text is stored once. Postgres: a GIN expression index.
+SQLITE_SCHEMA = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        content, content='document_texts', content_rowid='document_id',
+        tokenize='porter unicode61'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS document_texts_ai AFTER INSERT ON document_texts BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, content) VALUES (new.document_id, new.content);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS document_texts_ad AFTER DELETE ON document_texts BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, content) VALUES ('delete', old.document_id, old.content);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS document_texts_au AFTER UPDATE ON document_texts BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, content) VALUES ('delete', old.document_id, old.content);
+        INSERT INTO {FTS_TABLE}(rowid, content) VALUES (new.document_id, new.content);
+    END""",
+]
+
+POSTGRES_SCHEMA = [
+    "CREATE INDEX IF NOT EXISTS ix_document_texts_fts "
+    "ON document_texts USING GIN (to_tsvector('english', content))",
+]
+
+SNIPPET_TOKENS = 16
+
+# Matches "quoted phrases", bare terms and a leading '-' for exclusion
+QUERY_TOKEN = re.compile(r'(-?)"([^"]*)"|(-?)(\S+)')
+
+
+class SearchQueryError(ValueError):
+    """The search query could not be understood"""
+
+
+def init_search_index(engine):
+    """Create the full-text index structures for the configured database"""
+    statements = SQLITE_SCHEMA if engine.dialect.name == "sqlite" else POSTGRES_SCHEMA
+    with engine.begin() as conn:
+        for statement in statements:
+            conn.execute(sql(statement))
+
+
+def index_document(db: Session, document, content: str):
+    """Store (or replace) the extracted text for a document; caller commits"""
+    db.merge(DocumentText(document_id=document.id, project_id=document.project_id, content=content))
+
+
+def unindexed_documents(db: Session) -> List[Document]:
+    """PDF documents with no extracted text stored, e.g. uploaded before the index existed"""
+    return db.query(Document).outerjoin(DocumentText).filter(
+        DocumentText.document_id.is_(None),
+        Document.filename.ilike("%.pdf")
+    ).order_by(Document.id).all()
+
+
+def parse_query(query: str) -> Tuple[List[str], List[str]]:
+    """Split a user query into included and excluded terms/phrases"""
+    include, exclude = [], []
+    for phrase_neg, phrase, term_neg, term in QUERY_TOKEN.findall(query):
+        value = (phrase if phrase else term).strip()
+        if not value or value == "-":
+            continue
+        (exclude if (phrase_neg or term_neg) else include).append(value)
+    return include, exclude
+
+
+def _fts5_expression(terms: List[str], operator: str = " ") -> str:
+    # Quote everything so user input can never be parsed as FTS5 syntax;
+    # a trailing * on a bare term is kept as a prefix query. Terms are ANDed
+    # unless operator is " OR ".
+    parts = []
+    for term in terms:
+        prefix = term.endswith("*") and " " not in term
+        body = term.rstrip("*").replace('"', '""')
+        if body:
+            parts.append(f'"{body}"' + ("*" if prefix else ""))
+    return operator.join(parts)
+
+
+def _tsquery(include: List[str], exclude: List[str], params: Dict) -> str:
+    # Postgres counterpart of _fts5_expression: one tsquery per term, bound as
+    # parameters, so "phrases", prefix* terms and -exclusions behave as on SQLite
+    parts = []
+    for index, term in enumerate(include + exclude):
+        name = f"term{index}"
+        if " " in term:
+            function, value = "phraseto_tsquery", term
+        elif term.endswith("*"):
+            # Only word characters reach to_tsquery, so its operators can't be injected
+            words = re.findall(r"\w+", term)
+            if not words:
+                continue
+            function, value = "to_tsquery", " & ".join(f"{word}:*" for word in words)
+        else:
+            function, value = "plainto_tsquery", term
+        params[name] = value
+        expression = f"{function}('english', :{name})"
+        parts.append(expression if index < len(include) else f"!!{expression}")
+    if not parts:
+        raise SearchQueryError("Search query is empty")
+    return " && ".join(parts)
+
+
+def search_documents(
+    db: Session,
+    user_id: int,
+    query: str,
+    project_id: Optional[int] = None,
+    checklist_item_id: Optional[str] = None,
+    limit: int = 20,
+    offset: int = 0
+) -> List[Dict]:
+    """
+    Ranked full-text search over the user's documents
+
+    Supports "exact phrases", prefix* terms and -excluded terms; a query of
+    only exclusions (e.g. -setback with checklist_item_id=site-plan) returns
+    documents whose text lacks them.
+    """
+    include, exclude = parse_query(query)
+    if not include and not exclude:
+        raise SearchQueryError("Search query is empty")
+
+    params = {"user_id": user_id, "limit": limit, "offset": offset}
+    filters = ["p.user_id = :user_id"]
+    if project_id is not None:
+        filters.append("d.project_id = :project_id")
+        params["project_id"] = project_id
+    if checklist_item_id is not None:
+        filters.append("d.checklist_item_id = :checklist_item_id")
+        params["checklist_item_id"] = checklist_item_id
+
+    if db.bind.dialect.name == "sqlite":
+        statement = _sqlite_search(include, exclude, filters, params)
+    else:
+        statement = _postgres_search(include, exclude, filters, params)
+
+    rows = db.execute(sql(statement), params).mappings().all()
+    return [dict(row) for row in rows]
+
+
+def _sqlite_search(include, exclude, filters, params) -> str:
+    columns = (
+        "d.id AS document_id, d.project_id, p.name AS project_name, "
+        "d.checklist_item_id, d.filename"
+    )
+    joins = "JOIN documents d ON d.id = {rowid} JOIN projects p ON p.id = d.project_id"
+
+    if exclude:
+        # Any one excluded term is enough to drop a document
+        params["exclude"] = _fts5_expression(exclude, " OR ")
+        filters = filters + [
+            f"d.id NOT IN (SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :exclude)"
+        ]
+
+    if include:
+        params["include"] = _fts5_expression(include)
+        return (
+            # bm25() is lower-is-better; negate so rank sorts the same way on every database
+            f"SELECT {columns}, -bm25({FTS_TABLE}) AS rank, "
+            f"snippet({FTS_TABLE}, 0, '[', ']', '...', {SNIPPET_TOKENS}) AS snippet "
+            f"FROM {FTS_TABLE} {joins.format(rowid=f'{FTS_TABLE}.rowid')} "
+            f"WHERE {FTS_TABLE} MATCH :include AND {' AND '.join(filters)} "
+            f"ORDER BY rank DESC LIMIT :limit OFFSET :offset"
+        )
+
+    # Exclusions only: nothing to rank, show the start of each document
+    return (
+        f"SELECT {columns}, NULL AS rank, substr(t.content, 1, 200) AS snippet "
+        f"FROM document_texts t {joins.format(rowid='t.document_id')} "
+        f"WHERE {' AND '.join(filters)} "
+        f"ORDER BY d.uploaded_at DESC LIMIT :limit OFFSET :offset"
+    )
+
+
+def _postgres_search(include, exclude, filters, params) -> str:
+    query = _tsquery(include, exclude, params)
+    return (
+        "SELECT d.id AS document_id, d.project_id, p.name AS project_name, "
+        "d.checklist_item_id, d.filename, "
+        "ts_rank(to_tsvector('english', t.content), q) AS rank, "
+        "ts_headline('english', t.content, q, "
+        f"'StartSel=[, StopSel=], MaxWords={SNIPPET_TOKENS}, MinWords=4') AS snippet "
+        "FROM document_texts t "
+        "JOIN documents d ON d.id = t.document_id JOIN projects p ON p.id = d.project_id, "
+        f"(SELECT {query} AS q) terms "
+        f"WHERE to_tsvector('english', t.content) @@ q AND {' AND '.join(filters)} "
+        "ORDER BY rank DESC LIMIT :limit OFFSET :offset"
+    )
@@ -0,0 +1,241 @@
+import os
+import queue
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.core.database import SessionLocal
+from app.models.project import Document, DocumentText, Project, ValidationEvidence, ValidationResult
+
+UPLOAD_DIR = Path("uploads")
+
+# Files removed per batch before the sweeper yields the disk to live requests
+SWEEP_BATCH_SIZE = int(os.getenv("SWEEP_BATCH_SIZE", "200"))
+SWEEP_BATCH_PAUSE = float(os.getenv("SWEEP_BATCH_PAUSE", "0.05"))
+# Unreferenced files younger than this may belong to an upload still in progress
+SWEEP_ORPHAN_MIN_AGE = float(os.getenv("SWEEP_ORPHAN_MIN_AGE", "600"))
+# Directories of deleted projects wait here, under UPLOAD_DIR, until swept
+TRASH_DIR_NAME = ".deleted"
+
+# Keeps IN (...) lists well under database parameter limits
+ID_CHUNK_SIZE = 500
+
+
+def _chunks(values: List, size: int = ID_CHUNK_SIZE) -> Iterable[List]:
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def highest_project_dir_id(upload_dir: Optional[Path] = None) -> int:
+    """The largest project id with a directory under uploads/, detached ones included (0 if none)"""
+    upload_dir = upload_dir or UPLOAD_DIR
+    names = [entry.name for entry in upload_dir.iterdir()] if upload_dir.is_dir() else []
+    trash = upload_dir / TRASH_DIR_NAME
+    if trash.is_dir():
+        # Detached directories are named <project_id>-<uuid>
+        names.extend(entry.name.split("-", 1)[0] for entry in trash.iterdir())
+    return max((int(name) for name in names if name.isdigit()), default=0)
+
+
+def delete_projects(db: Session, project_ids: List[int]) -> Dict:
+    """
+    Delete projects and everything that hangs off them with set-based SQL
+
+    Nothing is loaded into the session; the caller is responsible for scoping
+    project_ids to the current user. Project directories are moved aside
+    straight away and their files reclaimed in the background.
+    """
+    document_count = 0
+    bytes_scheduled = 0
+    for chunk in _chunks(project_ids):
+        count, size = db.query(func.count(Document.id), func.coalesce(func.sum(Document.file_size), 0)).filter(
+            Document.project_id.in_(chunk)
+        ).one()
+        document_count += count
+        bytes_scheduled += size
+
+        # Children first so this works whether or not the database enforces ON DELETE CASCADE
+        db.query(DocumentText).filter(DocumentText.project_id.in_(chunk)).delete(synchronize_session=False)
+        db.query(ValidationEvidence).filter(ValidationEvidence.project_id.in_(chunk)).delete(synchronize_session=False)
+        db.query(ValidationResult).filter(ValidationResult.project_id.in_(chunk)).delete(synchronize_session=False)
+        db.query(Document).filter(Document.project_id.in_(chunk)).delete(synchronize_session=False)
+        db.query(Project).filter(Project.id.in_(chunk)).delete(synchronize_session=False)
+    db.commit()
+
+    file_sweeper.remove_project_dirs(project_ids)
+
+    return {
+        "deleted_projects": len(project_ids),
+        "deleted_documents": document_count,
+        "bytes_scheduled": bytes_scheduled,
+    }
+
+
+class FileSweeper:
+    """
+    Background thread that reclaims upload storage in small batches
+
+    Jobs are either detached directories to remove or a full orphan sweep,
+    which deletes project directories whose project no longer exists, files
+    no Document row references and anything left in the trash directory.
+    """
+
+    def __init__(self, upload_dir: Path = UPLOAD_DIR):
+        self.upload_dir = upload_dir
+        self._jobs = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self.stats = {
+            "files_removed": 0,
+            "directories_removed": 0,
+            "bytes_reclaimed": 0,
+            "orphan_sweeps": 0,
+            "pending_jobs": 0,
+            "last_sweep_at": None,
+            "last_error": None,
+        }
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="file-sweeper", daemon=True)
+                self._thread.start()
+
+    def _submit(self, job):
+        with self._lock:
+            self.stats["pending_jobs"] += 1
+        self._jobs.put(job)
+        self._ensure_started()
+
+    def remove_project_dirs(self, project_ids: List[int]):
+        """
+        Detach project directories now and delete their files in the background
+
+        The rename into the trash directory is synchronous and cheap, so a
+        pending removal can never reach files a later project with a reused id
+        writes to uploads/<id>/.
+        """
+        trash = self._trash_dir()
+        detached = []
+        for project_id in project_ids:
+            directory = self._project_dir(project_id)
+            if not directory.is_dir():
+                continue
+            trash.mkdir(parents=True, exist_ok=True)
+            target = trash / f"{project_id}-{uuid.uuid4().hex}"
+            try:
+                directory.rename(target)
+            except FileNotFoundError:
+                continue
+            detached.append(target)
+        if detached:
+            self._submit(("directories", detached))
+
+    def sweep_orphans(self):
+        self._submit(("orphans", None))
+
+    def report(self) -> Dict:
+        with self._lock:
+            return dict(self.stats)
+
+    def _run(self):
+        while True:
+            kind, payload = self._jobs.get()
+            try:
+                if kind == "directories":
+                    for directory in payload:
+                        self._remove_files(directory, remove_dir=True)
+                else:
+                    self._sweep_orphans()
+            except Exception as e:
+                print(f"File sweeper error: {e}")
+                with self._lock:
+                    self.stats["last_error"] = str(e)
+            finally:
+                with self._lock:
+                    self.stats["pending_jobs"] -= 1
+                    self.stats["last_sweep_at"] = datetime.now(timezone.utc).isoformat()
+
+    def _project_dir(self, project_id) -> Path:
+        return self.upload_dir / str(project_id)
+
+    def _trash_dir(self) -> Path:
+        return self.upload_dir / TRASH_DIR_NAME
+
+    def _remove_files(self, directory: Path, names=None, remove_dir: bool = False, min_age: float = 0):
+        """Delete files (all, or only `names`) from a directory in batches"""
+        if not directory.is_dir():
+            return
+        now = time.time()
+        removed = 0
+        for entry in list(os.scandir(directory)):
+            if not entry.is_file(follow_symlinks=False):
+                continue
+            if names is not None and entry.name not in names:
+                continue
+            stat = entry.stat(follow_symlinks=False)
+            if min_age and now - stat.st_mtime < min_age:
+                continue
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                continue
+            removed += 1
+            with self._lock:
+                self.stats["files_removed"] += 1
+                self.stats["bytes_reclaimed"] += stat.st_size
+            if removed % SWEEP_BATCH_SIZE == 0:
+                time.sleep(SWEEP_BATCH_PAUSE)
+        if remove_dir:
+            try:
+                directory.rmdir()
+            except OSError:
+                # Not empty (e.g. a young file kept back) or already gone
+                return
+            with self._lock:
+                self.stats["directories_removed"] += 1
+
+    def _sweep_orphans(self):
+        if not self.upload_dir.is_dir():
+            return
+        # Detached directories whose removal was interrupted, e.g. by a restart
+        trash = self._trash_dir()
+        if trash.is_dir():
+            for entry in os.scandir(trash):
+                if entry.is_dir(follow_symlinks=False):
+                    self._remove_files(Path(entry.path), remove_dir=True)
+        project_dirs = {
+            int(entry.name): Path(entry.path)
+            for entry in os.scandir(self.upload_dir)
+            if entry.is_dir() and entry.name.isdigit()
+        }
+        db = SessionLocal()
+        try:
+            for chunk in _chunks(sorted(project_dirs)):
+                existing = {row[0] for row in db.query(Project.id).filter(Project.id.in_(chunk))}
+                referenced = {}
+                for project_id, file_path in db.query(Document.project_id, Document.file_path).filter(
+                    Document.project_id.in_(chunk)
+                ):
+                    referenced.setdefault(project_id, set()).add(Path(file_path).name)
+
+                for project_id in chunk:
+                    directory = project_dirs[project_id]
+                    if project_id not in existing:
+                        self._remove_files(directory, remove_dir=True, min_age=SWEEP_ORPHAN_MIN_AGE)
+                        continue
+                    on_disk = {entry.name for entry in os.scandir(directory) if entry.is_file()}
+                    orphans = on_disk - referenced.get(project_id, set())
+                    if orphans:
+                        self._remove_files(directory, names=orphans, min_age=SWEEP_ORPHAN_MIN_AGE)
+        finally:
+            db.close()
+        with self._lock:
+            self.stats["orphan_sweeps"] += 1
+
+
+file_sweeper = FileSweeper()
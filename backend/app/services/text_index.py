@@ -0,0 +1,126 @@
+import re
+from typing import Dict, List, Optional
+
+# A word, optionally continued across hyphens, including a hyphen at a line
+# break ("set-\nback"). Hyphens are dropped when normalizing, so "set-back",
+# "set-\nback" and "setback" are the same token.
+WORD = re.compile(r"[a-z0-9]+(?:-[ \t]*(?:\r?\n[ \t]*)?[a-z0-9]+)*")
+HYPHEN_BREAK = re.compile(r"-[ \t]*\r?\n")
+NOT_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def lower_keeping_offsets(text: str) -> str:
+    """text.lower(), except characters whose lowercase is longer ('İ') are kept as is"""
+    lower = text.lower()
+    if len(lower) == len(text):
+        return lower
+    return "".join(char if len(char.lower()) != 1 else char.lower() for char in text)
+
+
+def normalize_keyword(keyword: str) -> List[str]:
+    """Split a keyword into the same normalized tokens the index uses"""
+    return [NOT_ALNUM.sub("", word) for word in WORD.findall(keyword.lower())]
+
+
+class TextIndex:
+    """
+    Token stream and positional index for one document's text, built once
+
+    Each token keeps its offsets into the original text and whether it was
+    joined across a hyphenated line break. Phrase lookups start from the
+    positions of the first keyword token, so matching all keywords stays
+    linear in the document length. The tokens are only built the first time
+    a keyword is not found as a plain substring.
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        # Same length as text, so offsets found in it index the original
+        self.lower = lower_keeping_offsets(text)
+        self.positions: Optional[Dict[str, List[int]]] = None
+
+    def _tokenize(self):
+        self.tokens: List[str] = []
+        self.starts: List[int] = []
+        self.ends: List[int] = []
+        self.hyphenated: List[bool] = []
+        # Whether each token was written with a hyphen inside it ('set-back')
+        self.hyphens: List[bool] = []
+        # Whether the gap before each token is pure whitespace, and whether it spans a line
+        self.space_before: List[bool] = []
+        self.line_before: List[bool] = []
+        self.positions = {}
+
+        previous_end = 0
+        for match in WORD.finditer(self.lower):
+            raw = match.group()
+            token = NOT_ALNUM.sub("", raw)
+            gap = self.lower[previous_end:match.start()]
+            self.positions.setdefault(token, []).append(len(self.tokens))
+            self.tokens.append(token)
+            self.starts.append(match.start())
+            self.ends.append(match.end())
+            self.hyphenated.append(bool(HYPHEN_BREAK.search(raw)))
+            self.hyphens.append("-" in raw)
+            self.space_before.append(not gap.strip())
+            self.line_before.append("\n" in gap)
+            previous_end = match.end()
+
+    def find(self, keyword: str) -> Optional[Dict]:
+        """
+        Locate a keyword, returning where and why it matched (None if absent)
+
+        reason is 'exact' for a plain substring match, else 'hyphenation' when
+        a word was hyphenated across a line break, 'hyphen' when the text and
+        keyword differ in hyphens ('set-back' for 'setback' or the reverse),
+        'line_break' when the phrase was split across lines, or 'whitespace'
+        when only the spacing differed. Like the substring check, the final
+        word may be a prefix ('site plan' matches 'site plans').
+        """
+        needle = keyword.lower()
+        start = self.lower.find(needle)
+        if start != -1:
+            return self._match("exact", start, start + len(needle))
+
+        raw_words = WORD.findall(keyword.lower())
+        words = [NOT_ALNUM.sub("", word) for word in raw_words]
+        if not words:
+            return None
+        keyword_hyphens = ["-" in word for word in raw_words]
+        if self.positions is None:
+            self._tokenize()
+        *leading, last = words
+        for position in self.positions.get(words[0], []):
+            end = position + len(words)
+            if end > len(self.tokens):
+                continue
+            if any(self.tokens[position + offset] != word for offset, word in enumerate(leading)):
+                continue
+            if not self.tokens[end - 1].startswith(last):
+                continue
+            if not all(self.space_before[index] for index in range(position + 1, end)):
+                continue
+            # Label by what actually differs, hyphens before spacing, since
+            # tokens compare equal once hyphens and spacing are both dropped
+            if any(self.hyphenated[index] for index in range(position, end)):
+                reason = "hyphenation"
+            elif self.hyphens[position:end] != keyword_hyphens:
+                reason = "hyphen"
+            elif any(self.line_before[index] for index in range(position + 1, end)):
+                reason = "line_break"
+            else:
+                reason = "whitespace"
+            return self._match(reason, self.starts[position], self.ends[end - 1])
+
+        # 'fire alarm' written as one hyphenated word ('fire-alarm', 'fire-\nalarm')
+        if leading:
+            for position in self.positions.get("".join(words), []):
+                reason = "hyphenation" if self.hyphenated[position] else "hyphen"
+                return self._match(reason, self.starts[position], self.ends[position])
+        return None
+
+    def _match(self, reason: str, start: int, end: int) -> Dict:
+        return {"reason": reason, "start": start, "end": end, "text": self.text[start:end]}
+
+    def match_keywords(self, keywords: List[str]) -> Dict[str, Optional[Dict]]:
+        return {keyword: self.find(keyword) for keyword in keywords}
@@ -0,0 +1,62 @@
+"""
+Compare two benchmark result files and flag regressions
+
+Usage (from backend/):
+    python -m benchmarks.compare baseline.json candidate.json [--threshold 0.10]
+
+Exits with status 1 when any benchmark's median slowed down by more than the threshold.
+"""
+from pathlib import Path
+from typing import Dict, List
+import argparse
+import json
+import sys
+
+
+def compare(baseline: Dict, candidate: Dict, threshold: float) -> List[Dict]:
+    """Return one row per benchmark present in both result sets"""
+    rows = []
+    old = baseline["benchmarks"]
+    new = candidate["benchmarks"]
+    for name in sorted(set(old) & set(new)):
+        old_median = old[name]["median"]
+        new_median = new[name]["median"]
+        ratio = new_median / old_median if old_median else float("inf")
+        rows.append({
+            "name": name,
+            "baseline": old_median,
+            "candidate": new_median,
+            "ratio": ratio,
+            "regression": ratio > 1 + threshold,
+        })
+    return rows
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files")
+    parser.add_argument("baseline", type=Path)
+    parser.add_argument("candidate", type=Path)
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="allowed relative slowdown of the median (default 0.10)")
+    args = parser.parse_args(argv)
+
+    baseline = json.loads(args.baseline.read_text())
+    candidate = json.loads(args.candidate.read_text())
+    rows = compare(baseline, candidate, args.threshold)
+
+    print(f"baseline  {baseline['meta'].get('commit')}")
+    print(f"candidate {candidate['meta'].get('commit')}")
+    for row in rows:
+        flag = "REGRESSION" if row["regression"] else ""
+        print(f"{row['name']:<55} {row['baseline'] * 1000:10.2f} ms -> "
+              f"{row['candidate'] * 1000:10.2f} ms  x{row['ratio']:.2f} {flag}")
+
+    regressions = [row for row in rows if row["regression"]]
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+from pathlib import Path
+from typing import Dict, List
+import random
+
+# Filler vocabulary deliberately avoids every signature and seal indicator
+# so that only the injected phrases decide the validation outcome.
+FILLER_WORDS = [
+    "beam", "column", "slab", "footing", "grid", "detail", "note", "wall",
+    "door", "window", "stair", "roof", "joist", "rafter", "header", "sill",
+    "finish", "schedule", "north", "south", "east", "west", "level", "datum",
+    "concrete", "steel", "timber", "masonry", "insulation", "membrane",
+    "drain", "vent", "duct", "conduit", "panel", "fixture", "typical",
+]
+
+KEYWORDS = ["zoning", "setback", "lot line", "elevation", "floor plan", "section"]
+SEAL_TEXT = "Professional Engineer License No. 012345"
+SIGNATURE_TEXT = "Signed and authorized by the property owner"
+
+LINES_PER_PAGE = 40
+WORDS_PER_LINE = 12
+
+# name -> page count, keywords to inject, seal, signature
+CORPUS_SPECS = [
+    {"name": "form-1p", "pages": 1, "keywords": ["property owner", "applicant"], "seal": False, "signature": True},
+    {"name": "site-plan-5p", "pages": 5, "keywords": ["zoning", "setback", "lot line"], "seal": True, "signature": False},
+    {"name": "arch-25p", "pages": 25, "keywords": ["elevation", "floor plan", "section"], "seal": True, "signature": True},
+    {"name": "arch-100p", "pages": 100, "keywords": ["elevation", "floor plan"], "seal": True, "signature": False},
+    {"name": "drawings-300p", "pages": 300, "keywords": KEYWORDS, "seal": True, "signature": True},
+    {"name": "drawings-500p", "pages": 500, "keywords": KEYWORDS, "seal": False, "signature": False},
+]
+
+QUICK_SPEC_NAMES = {"form-1p", "site-plan-5p", "arch-25p", "arch-100p"}
+
+# Rules that exercise every check in PDFParser.validate_document
+VALIDATION_RULES = {
+    "minPages": 1,
+    "requiredKeywords": KEYWORDS,
+    "mustContainSignature": True,
+    "mustBeProfessionallySealed": True,
+}
+
+
+def _filler_line(rng: random.Random) -> str:
+    return " ".join(rng.choice(FILLER_WORDS) for _ in range(WORDS_PER_LINE))
+
+
+def write_pdf(path: Path, spec: Dict, seed: int = 0) -> Path:
+    """Write a single deterministic PDF described by a corpus spec"""
+    rng = random.Random(f"{spec['name']}:{seed}")
+    pages = spec["pages"]
+
+    # Spread keywords evenly over the document, seal and signature go last
+    keyword_pages = {}
+    for index, keyword in enumerate(spec["keywords"]):
+        keyword_pages.setdefault((index * pages) // max(len(spec["keywords"]), 1), []).append(keyword)
+
+    # invariant=1 pins the creation date and document ID so output is byte-stable
+    pdf = canvas.Canvas(str(path), pagesize=letter, invariant=1)
+    width, height = letter
+    for page_number in range(pages):
+        text = pdf.beginText(50, height - 50)
+        text.setFont("Helvetica", 8)
+        text.textLine(f"Sheet {page_number + 1} of {pages}")
+        for keyword in keyword_pages.get(page_number, []):
+            text.textLine(f"Refer to {keyword} requirements on this sheet")
+        for _ in range(LINES_PER_PAGE):
+            text.textLine(_filler_line(rng))
+        if page_number == pages - 1:
+            if spec["seal"]:
+                text.textLine(SEAL_TEXT)
+            if spec["signature"]:
+                text.textLine(SIGNATURE_TEXT)
+        pdf.drawText(text)
+        pdf.showPage()
+    pdf.save()
+    return path
+
+
+def build_corpus(out_dir: Path, quick: bool = False) -> List[Dict]:
+    """Generate (or reuse) the benchmark corpus and return its specs with file paths"""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    corpus = []
+    for spec in CORPUS_SPECS:
+        if quick and spec["name"] not in QUICK_SPEC_NAMES:
+            continue
+        path = out_dir / f"{spec['name']}.pdf"
+        if not path.exists():
+            write_pdf(path, spec)
+        corpus.append({**spec, "path": str(path)})
+    return corpus
@@ -0,0 +1,274 @@
+"""
+Performance benchmark suite
+
+Usage (from backend/):
+    python -m benchmarks.run                 # full suite
+    python -m benchmarks.run --quick         # small corpus and databases
+    python -m benchmarks.run --only startup  # worker boot and engine import cost
+    python -m benchmarks.compare old.json new.json
+"""
+from datetime import datetime, timezone
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Callable, Dict, List, Optional
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.corpus import build_corpus, VALIDATION_RULES
+
+BENCHMARK_DIR = Path(__file__).resolve().parent
+DEFAULT_CORPUS_DIR = BENCHMARK_DIR / ".corpus"
+DEFAULT_RESULTS_DIR = BENCHMARK_DIR / "results"
+
+CHECKLIST_SIZES = [10, 50, 200, 1000]
+PROJECT_COUNTS = [10, 100, 1000, 10000, 100000]
+QUICK_PROJECT_COUNTS = [10, 100, 1000]
+DOCUMENTS_PER_PROJECT = 2
+
+
+def time_call(fn: Callable, repeat: int) -> Dict:
+    """Run fn `repeat` times and return timing statistics in seconds"""
+    fn()  # warm up caches and lazy imports
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return {
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "mean": statistics.mean(samples),
+        "stdev": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "repeat": repeat,
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "HEAD"], cwd=BENCHMARK_DIR, stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def bench_pdf_parser(corpus: List[Dict], repeat: int) -> Dict:
+    from app.services.pdf_parser import PDFParser
+
+    results = {}
+    for spec in corpus:
+        params = {"pages": spec["pages"]}
+        results[f"validate_document[{spec['name']}]"] = {
+            **time_call(lambda: PDFParser.validate_document(spec["path"], VALIDATION_RULES), repeat),
+            "params": params,
+        }
+        results[f"get_document_summary[{spec['name']}]"] = {
+            **time_call(lambda: PDFParser.get_document_summary(spec["path"]), repeat),
+            "params": params,
+        }
+    return results
+
+
+def make_checklist(size: int) -> List[Dict]:
+    return [
+        {"id": f"item-{i}", "name": f"Checklist Item {i}", "required": i % 3 != 0, "category": "general"}
+        for i in range(size)
+    ]
+
+
+def bench_report_generator(repeat: int) -> Dict:
+    from app.services.report_generator import generate_readiness_report
+
+    results = {}
+    for size in CHECKLIST_SIZES:
+        checklist = make_checklist(size)
+        project = SimpleNamespace(
+            id=1,
+            version=1,
+            name="Benchmark Project",
+            jurisdiction="New York City, NY",
+            created_at=datetime(2024, 1, 1),
+            jurisdiction_data={"checklist": checklist},
+        )
+        # Every other item has an upload
+        documents = [
+            SimpleNamespace(id=index, checklist_item_id=item["id"], filename=f"{item['id']}.pdf")
+            for index, item in enumerate(checklist[::2], start=1)
+        ]
+        results[f"generate_readiness_report[{size}]"] = {
+            **time_call(lambda: generate_readiness_report(project, documents), repeat),
+            "params": {"checklist_items": size, "documents": len(documents)},
+        }
+    return results
+
+
+def seed_database(session, project_count: int):
+    """Insert one user owning `project_count` projects with documents"""
+    from app.models.user import User
+    from app.models.project import Project, Document
+
+    user = User(email="bench@example.com", username="bench", hashed_password="x")
+    session.add(user)
+    session.commit()
+
+    jurisdiction_data = {"checklist": make_checklist(12)}
+    batch = 5000
+    for offset in range(0, project_count, batch):
+        count = min(batch, project_count - offset)
+        session.execute(
+            Project.__table__.insert(),
+            [
+                {"name": f"Project {offset + i}", "jurisdiction": "New York City, NY",
+                 "jurisdiction_data": jurisdiction_data, "user_id": user.id}
+                for i in range(count)
+            ],
+        )
+    session.commit()
+
+    project_ids = [row[0] for row in session.query(Project.id)]
+    for offset in range(0, len(project_ids), batch):
+        session.execute(
+            Document.__table__.insert(),
+            [
+                {"project_id": project_id, "checklist_item_id": f"item-{d}",
+                 "filename": f"item-{d}.pdf", "file_path": f"uploads/{project_id}/item-{d}.pdf",
+                 "file_size": 1024, "file_type": "application/pdf"}
+                for project_id in project_ids[offset:offset + batch]
+                for d in range(DOCUMENTS_PER_PROJECT)
+            ],
+        )
+    session.commit()
+    return user
+
+
+def bench_list_projects(project_counts: List[int], repeat: int) -> Dict:
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from app.core.database import Base
+    from app.api.routes.projects import list_projects
+
+    results = {}
+    for project_count in project_counts:
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = create_engine(f"sqlite:///{tmp}/bench.db", connect_args={"check_same_thread": False})
+            Base.metadata.create_all(bind=engine)
+            session = sessionmaker(bind=engine)()
+            try:
+                user = seed_database(session, project_count)
+
+                def first_page():
+                    session.expire_all()
+                    list_projects(skip=0, limit=100, current_user=user, db=session)
+
+                def last_page():
+                    session.expire_all()
+                    list_projects(skip=max(project_count - 100, 0), limit=100, current_user=user, db=session)
+
+                params = {"projects": project_count, "documents_per_project": DOCUMENTS_PER_PROJECT}
+                results[f"list_projects[first_page,{project_count}]"] = {**time_call(first_page, repeat), "params": params}
+                results[f"list_projects[last_page,{project_count}]"] = {**time_call(last_page, repeat), "params": params}
+            finally:
+                session.close()
+                engine.dispose()
+    return results
+
+
+# Runs in a fresh interpreter so module caches from this process don't hide import cost
+STARTUP_PROBE = """
+import json, resource, time
+start = time.perf_counter()
+import app.main
+boot = time.perf_counter() - start
+boot_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+from app.services.engines import preload_engines
+timings = preload_engines()
+print(json.dumps({"boot": boot, "boot_rss_kb": boot_rss, "engines": timings,
+                  "rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}))
+"""
+
+
+def bench_startup(repeat: int) -> Dict:
+    """Time `import app.main` and each lazily loaded engine in fresh processes"""
+    samples = []
+    for _ in range(repeat + 1):
+        output = subprocess.check_output([sys.executable, "-c", STARTUP_PROBE], cwd=BENCHMARK_DIR.parent)
+        samples.append(json.loads(output))
+    samples = samples[1:]  # first run warms the OS file cache
+
+    def stats(values: List[float]) -> Dict:
+        return {
+            "min": min(values),
+            "median": statistics.median(values),
+            "mean": statistics.mean(values),
+            "stdev": statistics.stdev(values) if len(values) > 1 else 0.0,
+            "repeat": len(values),
+        }
+
+    results = {
+        "startup[import_app_main]": {
+            **stats([sample["boot"] for sample in samples]),
+            "params": {"max_rss_kb": max(sample["boot_rss_kb"] for sample in samples)},
+        },
+    }
+    for engine in samples[0]["engines"]:
+        results[f"startup[preload_{engine}]"] = {
+            **stats([sample["engines"][engine] for sample in samples]),
+            "params": {"max_rss_kb_after_all_engines": max(sample["rss_kb"] for sample in samples)},
+        }
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run the permit readiness benchmark suite")
+    parser.add_argument("--quick", action="store_true", help="small corpus and databases only")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per benchmark")
+    parser.add_argument("--corpus-dir", type=Path, default=DEFAULT_CORPUS_DIR)
+    parser.add_argument("--output", type=Path, help="results file (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--only", choices=["startup", "pdf", "report", "projects"], action="append",
+                        help="run only the given group (repeatable)")
+    args = parser.parse_args(argv)
+
+    groups = set(args.only or ["startup", "pdf", "report", "projects"])
+    commit = git_commit()
+    benchmarks = {}
+
+    if "startup" in groups:
+        benchmarks.update(bench_startup(args.repeat))
+    if "pdf" in groups:
+        corpus = build_corpus(args.corpus_dir, quick=args.quick)
+        benchmarks.update(bench_pdf_parser(corpus, args.repeat))
+    if "report" in groups:
+        benchmarks.update(bench_report_generator(args.repeat))
+    if "projects" in groups:
+        counts = QUICK_PROJECT_COUNTS if args.quick else PROJECT_COUNTS
+        benchmarks.update(bench_list_projects(counts, args.repeat))
+
+    results = {
+        "meta": {
+            "commit": commit,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "quick": args.quick,
+        },
+        "benchmarks": benchmarks,
+    }
+
+    output = args.output or DEFAULT_RESULTS_DIR / f"{(commit or 'working-tree')[:12]}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2, sort_keys=True))
+
+    for name, stats in sorted(benchmarks.items()):
+        print(f"{name:<55} median {stats['median'] * 1000:10.2f} ms")
+    print(f"Results written to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+import pytest
+from fastapi.testclient import TestClient
+from PyPDF2 import PageObject, PdfWriter
+from PyPDF2.generic import ArrayObject, DecodedStreamObject, DictionaryObject, NameObject
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import app.models.user  # noqa: F401 - registers the users table for create_all
+from app.core.database import Base, get_db
+from app.core.security import get_current_active_user
+from app.main import app
+from app.models.project import Project
+from app.models.user import User
+
+CHECKLIST = [
+    {"id": "pw1", "name": "PW1 Application", "required": True,
+     "validationRules": {"requiredKeywords": ["property owner"], "mustContainSignature": True}},
+    {"id": "site-plan", "name": "Site Plan", "required": True},
+    {"id": "survey", "name": "Survey", "required": False},
+]
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'api.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def user(db):
+    user = User(email="u@example.com", username="u", hashed_password="x")
+    db.add(user)
+    db.commit()
+    return user
+
+
+@pytest.fixture
+def client(session_factory, user):
+    """An API client signed in as `user`, backed by the test database; startup hooks don't run"""
+    def override_get_db():
+        session = session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    def override_current_user():
+        session = session_factory()
+        try:
+            return session.get(User, user.id)
+        finally:
+            session.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_active_user] = override_current_user
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def project(db, user):
+    project = Project(name="Main St", jurisdiction="NYC", jurisdiction_data={"checklist": CHECKLIST}, user=user)
+    db.add(project)
+    db.commit()
+    return project
+
+
+def _stream(writer, data: bytes):
+    stream = DecodedStreamObject()
+    stream.set_data(data)
+    return writer._add_object(stream)
+
+
+def _write_pdf(path, page_streams):
+    """A PDF with one page per entry, each page's /Contents an array of the given streams"""
+    writer = PdfWriter()
+    for streams in page_streams:
+        page = PageObject.create_blank_page(width=612, height=792)
+        font = DictionaryObject({
+            NameObject("/Type"): NameObject("/Font"),
+            NameObject("/Subtype"): NameObject("/Type1"),
+            NameObject("/BaseFont"): NameObject("/Helvetica"),
+        })
+        page[NameObject("/Resources")] = DictionaryObject({
+            NameObject("/Font"): DictionaryObject({NameObject("/F1"): font}),
+        })
+        page[NameObject("/Contents")] = ArrayObject(_stream(writer, data) for data in streams)
+        writer.add_page(page)
+    with open(path, "wb") as file:
+        writer.write(file)
+    return str(path)
+
+
+@pytest.fixture
+def write_pdf():
+    return _write_pdf
@@ -0,0 +1,53 @@
+import asyncio
+
+from fastapi import HTTPException
+
+from app.core import admission
+from app.core.admission import AdmissionLimiter
+
+
+async def _run(limiter, count, hold):
+    async def request():
+        try:
+            async with limiter.slot():
+                await asyncio.sleep(hold)
+            return 200
+        except HTTPException as e:
+            return e.status_code
+    return await asyncio.gather(*(request() for _ in range(count)))
+
+
+def test_queue_beyond_capacity_is_rejected_without_blocking_threads():
+    limiter = AdmissionLimiter("test", max_concurrent=2, max_queue=2, queue_timeout=5, retry_after=1)
+
+    # Ten requests queue on the event loop alone; with thread-based waiting
+    # the rejected ones would have needed a worker thread each
+    statuses = asyncio.run(_run(limiter, 10, 0.05))
+
+    assert statuses.count(200) == 4
+    assert statuses.count(429) == 6
+    assert limiter.stats()["in_flight"] == 0
+    assert limiter.stats()["waiting"] == 0
+
+
+def test_waiting_past_the_timeout_is_rejected():
+    limiter = AdmissionLimiter("test", max_concurrent=1, max_queue=5, queue_timeout=0.05, retry_after=1)
+
+    statuses = asyncio.run(_run(limiter, 2, 0.3))
+
+    assert sorted(statuses) == [200, 503]
+    assert limiter.stats()["rejected_timeout"] == 1
+
+
+def test_saturated_endpoint_answers_429_with_retry_after(client, project, monkeypatch):
+    limiter = admission.report_limiter
+    # No free slots and no room to queue
+    monkeypatch.setattr(limiter, "_slots", asyncio.Semaphore(0))
+    monkeypatch.setattr(limiter, "max_queue", 0)
+    rejected = limiter.rejected_queue_full
+
+    response = client.get(f"/api/projects/{project.id}/report")
+
+    assert response.status_code == 429
+    assert response.headers["retry-after"] == str(limiter.retry_after)
+    assert limiter.rejected_queue_full == rejected + 1
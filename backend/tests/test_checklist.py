@@ -0,0 +1,59 @@
+def _checklist(db, project):
+    db.refresh(project)
+    return project.jurisdiction_data["checklist"]
+
+
+def test_stale_version_is_rejected_and_changes_nothing(client, db, project):
+    before = _checklist(db, project)
+
+    response = client.patch(f"/api/projects/{project.id}/checklist", json={
+        "version": project.version - 1,
+        "operations": [{"op": "add", "item": {"id": "noise", "name": "Noise Study"}}],
+    })
+
+    assert response.status_code == 409
+    assert response.json()["detail"]["version"] == project.version
+    assert _checklist(db, project) == before
+
+
+def test_multi_operation_patch_bumps_the_version_once(client, db, project):
+    version = project.version
+    response = client.patch(f"/api/projects/{project.id}/checklist", json={
+        "version": version,
+        "operations": [
+            {"op": "add", "item": {"id": "noise", "name": "Noise Study"}},
+            {"op": "add", "item": {"id": "traffic", "name": "Traffic Study"}},
+            {"op": "update", "item_id": "noise", "changes": {"required": True}},
+            {"op": "remove", "item_id": "traffic"},
+        ],
+    })
+
+    assert response.status_code == 200
+    assert response.json()["version"] == version + 1
+    assert _checklist(db, project)[-1] == {"id": "noise", "name": "Noise Study", "custom": True, "required": True}
+    assert project.version == version + 1
+
+
+def test_failing_operation_rolls_back_the_whole_batch(client, db, project):
+    before = _checklist(db, project)
+
+    response = client.patch(f"/api/projects/{project.id}/checklist", json={
+        "version": project.version,
+        "operations": [
+            {"op": "add", "item": {"id": "noise", "name": "Noise Study"}},
+            {"op": "remove", "item_id": "not-there"},
+        ],
+    })
+
+    assert response.status_code == 404
+    assert _checklist(db, project) == before
+
+
+def test_legacy_add_generates_an_id_that_can_be_removed(client, db, project):
+    response = client.post(f"/api/projects/{project.id}/custom-items", json={"name": "Noise Study"})
+
+    assert response.status_code == 200
+    item_id = response.json()["item"]["id"]
+    assert item_id.startswith("custom-")
+    assert client.delete(f"/api/projects/{project.id}/custom-items/{item_id}").status_code == 200
+    assert all(item["id"] != item_id for item in _checklist(db, project))
@@ -0,0 +1,41 @@
+import json
+
+import pytest
+
+from app.cli import main
+
+
+def _run(tmp_path, *args):
+    output = tmp_path / "results.jsonl"
+    code = main(["validate", str(tmp_path / "submission"), "-j", "new-york-city",
+                 "-o", str(output), "-q", *args])
+    records = [json.loads(line) for line in output.read_text().splitlines()]
+    return code, records
+
+
+def test_non_pdf_does_not_satisfy_an_item_with_rules(tmp_path):
+    submission = tmp_path / "submission"
+    submission.mkdir()
+    (submission / "site-plan.docx").write_bytes(b"not a pdf")
+    (submission / "environmental.docx").write_bytes(b"no rules to check")
+
+    code, records = _run(tmp_path)
+
+    files = {record["file"]: record for record in records if record["type"] == "file"}
+    summary = records[-1]
+    assert code == 1
+    assert files["site-plan.docx"]["status"] == "skipped"
+    assert files["environmental.docx"]["status"] == "pass"
+    assert "site-plan" in summary["failing_required"]
+    assert "environmental" not in summary["missing_required"] + summary["failing_required"]
+
+
+@pytest.mark.parametrize("pattern", ["(?P<item>[", "^([a-z-]+)_"])
+def test_bad_pattern_is_a_usage_error(tmp_path, capsys, pattern):
+    (tmp_path / "submission").mkdir()
+
+    with pytest.raises(SystemExit) as exc:
+        main(["validate", str(tmp_path / "submission"), "-j", "new-york-city", "--pattern", pattern])
+
+    assert exc.value.code == 2
+    assert "--pattern" in capsys.readouterr().err
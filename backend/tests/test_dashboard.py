@@ -0,0 +1,64 @@
+from datetime import datetime
+
+import pytest
+
+from app.models.project import Document, Project
+from app.models.user import User
+from app.services.dashboard import compute_dashboard, dashboard_statement
+
+CHECKLIST = [
+    {"id": "pw1", "name": "PW1 Application", "required": True},
+    {"id": "site-plan", "name": "Site Plan", "required": True},
+    {"id": "survey", "name": "Survey", "required": False},
+]
+
+
+def _project(db, user, jurisdiction, created_at, uploads, checklist=CHECKLIST):
+    project = Project(name=jurisdiction, jurisdiction=jurisdiction, jurisdiction_data={"checklist": checklist},
+                      user=user, created_at=created_at)
+    db.add(project)
+    db.flush()
+    for item_id, uploaded_at in uploads.items():
+        db.add(Document(project_id=project.id, checklist_item_id=item_id, filename=f"{item_id}.pdf",
+                        file_path=f"{item_id}.pdf", uploaded_at=uploaded_at))
+    return project
+
+
+def test_sqlite_dashboard_counts_readiness_and_missing_items(db, user):
+    start = datetime(2026, 1, 1)
+    # Ready after 2 days: its last required item arrived on Jan 3
+    _project(db, user, "NYC", start, {"pw1": datetime(2026, 1, 2), "site-plan": datetime(2026, 1, 3)})
+    # Ready after 4 days; the later duplicate upload doesn't move that
+    _project(db, user, "NYC", start, {"pw1": datetime(2026, 1, 5), "site-plan": datetime(2026, 1, 4),
+                                      "survey": datetime(2026, 1, 9)})
+    _project(db, user, "NYC", start, {"survey": datetime(2026, 1, 2)})
+    _project(db, user, "Boston", start, {"pw1": datetime(2026, 1, 2)})
+    # Nothing required, so ready from the start
+    _project(db, user, "Boston", start, {}, checklist=[])
+    # Another user's project is not counted
+    other = User(email="o@example.com", username="o", hashed_password="x")
+    _project(db, other, "NYC", start, {})
+    db.commit()
+
+    dashboard = compute_dashboard(db, user.id)
+
+    assert dashboard["projects"] == 5
+    assert dashboard["ready"] == 3
+    assert dashboard["average_completion"] == 70.0
+    assert dashboard["average_days_to_ready"] == 2.0
+    assert dashboard["by_jurisdiction"] == [
+        {"jurisdiction": "NYC", "projects": 3, "ready": 2, "average_completion": 66.7},
+        {"jurisdiction": "Boston", "projects": 2, "ready": 1, "average_completion": 75.0},
+    ]
+    assert dashboard["most_missing"] == [
+        {"item_id": "site-plan", "item_name": "Site Plan", "missing_in": 2},
+        {"item_id": "pw1", "item_name": "PW1 Application", "missing_in": 1},
+    ]
+
+
+def test_postgres_dashboard_statement_parses():
+    pglast = pytest.importorskip("pglast")
+
+    statement = dashboard_statement("postgresql").replace(":user_id", "$1")
+
+    assert len(pglast.parse_sql(statement)) == 1
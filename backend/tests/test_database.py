@@ -0,0 +1,61 @@
+import threading
+
+import pytest
+from sqlalchemy import create_engine, text
+
+import app.models.user  # noqa: F401 - registers the users table
+from app.core import database
+from app.services import storage
+
+
+@pytest.fixture
+def legacy_db(tmp_path, monkeypatch):
+    """A database whose projects table predates AUTOINCREMENT, with project 3 already deleted"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}", connect_args={"timeout": 30})
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE projects (id INTEGER PRIMARY KEY, name VARCHAR NOT NULL, "
+                          "jurisdiction VARCHAR NOT NULL, jurisdiction_data JSON, version INTEGER NOT NULL DEFAULT '1', "
+                          "user_id INTEGER NOT NULL, created_at DATETIME, updated_at DATETIME)"))
+        for project_id in (1, 2, 3):
+            conn.execute(text("INSERT INTO projects (id, name, jurisdiction, user_id) VALUES (:id, 'P', 'NYC', 1)"),
+                         {"id": project_id})
+        conn.execute(text("DELETE FROM projects WHERE id = 3"))
+    uploads = tmp_path / "uploads"
+    (uploads / storage.TRASH_DIR_NAME / "3-0123abcd").mkdir(parents=True)
+    monkeypatch.setattr(database, "engine", engine)
+    monkeypatch.setattr(storage, "UPLOAD_DIR", uploads)
+    yield engine
+    engine.dispose()
+
+
+def _next_project_id(engine):
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO projects (name, jurisdiction, user_id) VALUES ('New', 'NYC', 1)"))
+        return conn.execute(text("SELECT MAX(id) FROM projects")).scalar()
+
+
+def test_migration_does_not_reuse_ids_deleted_before_it(legacy_db):
+    database.init_db()
+
+    assert _next_project_id(legacy_db) == 4
+
+
+def test_workers_starting_together_migrate_once(legacy_db):
+    errors = []
+
+    def start_worker():
+        try:
+            database._add_missing_autoincrement()
+        except Exception as e:
+            errors.append(e)
+
+    workers = [threading.Thread(target=start_worker) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    assert errors == []
+    with legacy_db.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM projects")).scalar() == 2
+        assert not database._needs_autoincrement(conn, "projects")
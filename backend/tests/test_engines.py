@@ -0,0 +1,20 @@
+import sys
+
+from app.services import engines
+
+
+def test_lazy_first_use_import_is_timed(monkeypatch):
+    monkeypatch.setattr(engines, "ENGINE_MODULES", {"csv": "csv"})
+    monkeypatch.setattr(engines, "import_timings", {})
+    monkeypatch.delitem(sys.modules, "csv", raising=False)
+
+    assert engines.engine_status()["engines"]["csv"] == {"loaded": False, "import_seconds": None}
+    module = engines.load_engine("csv")
+
+    assert module is sys.modules["csv"]
+    status = engines.engine_status()["engines"]["csv"]
+    assert status["loaded"] is True
+    assert status["import_seconds"] > 0
+    # A second use finds it loaded and keeps the first timing
+    engines.load_engine("csv")
+    assert engines.engine_status()["engines"]["csv"]["import_seconds"] == status["import_seconds"]
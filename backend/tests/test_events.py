@@ -0,0 +1,58 @@
+import pytest
+from starlette.websockets import WebSocketDisconnect
+
+from app.api.routes import documents, projects
+from app.core.security import create_access_token
+
+
+@pytest.fixture
+def events_url(project, session_factory, monkeypatch):
+    # The WebSocket route opens its own session rather than using get_db
+    monkeypatch.setattr(projects, "SessionLocal", session_factory)
+    return f"/api/projects/{project.id}/events"
+
+
+@pytest.mark.parametrize("token", ["not-a-token", create_access_token({"sub": "999"})])
+def test_unauthorized_subscriber_is_closed_with_policy_violation(client, events_url, token):
+    with pytest.raises(WebSocketDisconnect) as exc:
+        with client.websocket_connect(f"{events_url}?token={token}") as websocket:
+            websocket.receive_json()
+
+    assert exc.value.code == 1008
+
+
+def test_inactive_user_is_closed_with_policy_violation(client, db, user, events_url):
+    user.is_active = False
+    db.commit()
+    token = create_access_token({"sub": str(user.id)})
+
+    with pytest.raises(WebSocketDisconnect) as exc:
+        with client.websocket_connect(f"{events_url}?token={token}") as websocket:
+            websocket.receive_json()
+
+    assert exc.value.code == 1008
+
+
+def test_upload_events_arrive_in_order(client, user, project, events_url, tmp_path, monkeypatch, write_pdf):
+    monkeypatch.setattr(documents, "UPLOAD_DIR", tmp_path)
+    path = write_pdf(tmp_path / "source.pdf", [[b"BT /F1 12 Tf 72 720 Td (Signed by the property owner) Tj ET"]])
+    token = create_access_token({"sub": str(user.id)})
+
+    with client.websocket_connect(f"{events_url}?token={token}") as websocket:
+        with open(path, "rb") as file:
+            client.post("/api/documents/", data={"project_id": project.id, "checklist_item_id": "pw1"},
+                        files={"file": ("pw1.pdf", file, "application/pdf")})
+        events = [websocket.receive_json() for _ in range(8)]
+
+    assert [(event["type"], event.get("rule")) for event in events] == [
+        ("upload_received", None),
+        ("document_scanned", None),
+        ("validation_started", None),
+        ("rule_result", "textExtraction"),
+        ("rule_result", "requiredKeywords"),
+        ("rule_result", "mustContainSignature"),
+        ("validation_finished", None),
+        ("readiness_changed", None),
+    ]
+    assert events[-1]["required_uploaded"] == 1
+    assert all(event["project_id"] == project.id for event in events)
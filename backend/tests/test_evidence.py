@@ -0,0 +1,88 @@
+import pytest
+
+from app.api.routes import documents
+from app.core.security import get_current_active_user
+from app.main import app
+from app.models.project import Document, Project
+from app.models.user import User
+from app.services.pdf_parser import PDFParser
+from app.services.text_index import TextIndex
+
+# 'İ' lowercases to two code points, which used to shift every later offset
+TEXT = "İSTANBUL office. Signed by the property owner, Professional Engineer License No 1234"
+
+
+@pytest.mark.parametrize("find", [PDFParser.find_signature_indicators, PDFParser.find_professional_seal])
+def test_offsets_index_the_original_text(find):
+    matches = find(TEXT)
+
+    assert matches
+    for match in matches:
+        assert TEXT[match["start"]:match["end"]].lower() == match["term"].lower()
+
+
+def test_standalone_pe_and_ra_are_not_seals():
+    text = "the ra of the pe class"
+
+    assert PDFParser.find_professional_seal(text) == []
+    assert not PDFParser.check_professional_seal(text)
+
+
+def test_keyword_offsets_index_the_original_text():
+    match = TextIndex(TEXT).find("property owner")
+
+    assert TEXT[match["start"]:match["end"]] == "property owner"
+
+
+def test_upload_stores_evidence_served_per_document(client, project, tmp_path, monkeypatch, write_pdf):
+    monkeypatch.setattr(documents, "UPLOAD_DIR", tmp_path)
+    path = write_pdf(tmp_path / "source.pdf", [
+        [b"BT /F1 12 Tf 72 720 Td (Cover sheet) Tj ET"],
+        [b"BT /F1 12 Tf 72 720 Td (Signed by the property owner) Tj ET"],
+    ])
+    with open(path, "rb") as file:
+        uploaded = client.post("/api/documents/", data={"project_id": project.id, "checklist_item_id": "pw1"},
+                               files={"file": ("pw1.pdf", file, "application/pdf")})
+    document_id = uploaded.json()["id"]
+
+    evidence = client.get(f"/api/documents/{document_id}/evidence").json()["evidence"]
+    signature = client.get(f"/api/documents/{document_id}/evidence",
+                           params={"rule": "mustContainSignature"}).json()["evidence"]
+
+    assert {(row["rule"], row["term"], row["page"]) for row in evidence} == {
+        ("requiredKeywords", "property owner", 2),
+        ("mustContainSignature", "signed", 2),
+    }
+    assert signature == [{"rule": "mustContainSignature", "term": "signed", "page": 2, "start": 0, "end": 6}]
+    assert client.get("/api/documents/0/evidence").status_code == 404
+
+
+def test_evidence_is_only_served_to_the_project_owner(client, db):
+    other = User(email="o@example.com", username="o", hashed_password="x")
+    project = Project(name="Theirs", jurisdiction="NYC", jurisdiction_data={}, user=other)
+    db.add(project)
+    db.flush()
+    document = Document(project_id=project.id, checklist_item_id="pw1", filename="pw1.pdf", file_path="pw1.pdf")
+    db.add(document)
+    db.commit()
+
+    assert client.get(f"/api/documents/{document.id}/evidence").status_code == 404
+    app.dependency_overrides.pop(get_current_active_user)
+    assert client.get(f"/api/documents/{document.id}/evidence").status_code == 401
+
+
+def test_upload_failures_are_logged_with_a_traceback(client, project, tmp_path, monkeypatch, write_pdf, caplog):
+    monkeypatch.setattr(documents, "UPLOAD_DIR", tmp_path)
+
+    def broken_index(*args):
+        raise RuntimeError("index unavailable")
+
+    monkeypatch.setattr(documents, "index_document", broken_index)
+    path = write_pdf(tmp_path / "source.pdf", [[b"BT /F1 12 Tf 72 720 Td (Signed) Tj ET"]])
+    with open(path, "rb") as file:
+        response = client.post("/api/documents/", data={"project_id": project.id, "checklist_item_id": "pw1"},
+                               files={"file": ("pw1.pdf", file, "application/pdf")})
+
+    assert response.status_code == 200
+    record = next(record for record in caplog.records if record.name == documents.__name__)
+    assert record.exc_info[1].args == ("index unavailable",)
@@ -0,0 +1,107 @@
+import os
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from app.services import pdf_parser
+from app.services.pdf_parser import PDFParser
+
+
+def test_scan_pages_reads_every_stream_of_a_multi_stream_page(tmp_path, write_pdf):
+    path = write_pdf(tmp_path / "multi.pdf", [
+        # The text operator only appears in the second stream
+        [b"q 1 0 0 1 0 0 cm Q", b"BT /F1 12 Tf 72 720 Td (Site plan) Tj ET"],
+        [b"q Q", b"0 0 m 10 10 l S"],
+    ])
+
+    assert PDFParser.scan_pages(path) == ["text", "blank"]
+    assert "Site plan" in PDFParser.extract_text(path)
+
+
+def test_scan_pages_marks_an_unreadable_page_unknown(tmp_path, monkeypatch, write_pdf):
+    path = write_pdf(tmp_path / "multi.pdf", [
+        [b"BT /F1 12 Tf 72 720 Td (First) Tj ET"],
+        [b"BT /F1 12 Tf 72 720 Td (Second) Tj ET"],
+    ])
+    page_content = pdf_parser._page_content
+    calls = []
+
+    def failing_on_second_page(page):
+        calls.append(page)
+        if len(calls) == 2:
+            raise ValueError("corrupt content stream")
+        return page_content(page)
+
+    monkeypatch.setattr(pdf_parser, "_page_content", failing_on_second_page)
+    kinds = PDFParser.scan_pages(path)
+
+    assert kinds == ["text", "unknown"]
+    # Unknown pages are still extracted rather than assumed to be images
+    monkeypatch.undo()
+    assert PDFParser.extract_pages(path, page_kinds=kinds)[1].strip() == "Second"
+    assert PDFParser.summarize_page_kinds(kinds)["pages_without_text"] == []
+
+
+def test_parallel_extraction_recovers_from_a_broken_pool(tmp_path, write_pdf):
+    path = write_pdf(tmp_path / "pages.pdf", [
+        [f"BT /F1 12 Tf 72 720 Td (Page {number}) Tj ET".encode()] for number in range(1, 5)
+    ])
+    # A worker dying mid-task breaks the whole pool
+    broken = pdf_parser._get_extraction_pool()
+    with pytest.raises(BrokenProcessPool):
+        broken.submit(os._exit, 1).result()
+
+    pages = PDFParser._extract_pages_parallel(path, 4, 2)
+
+    assert [page.strip() for page in pages] == ["Page 1", "Page 2", "Page 3", "Page 4"]
+    assert pdf_parser._get_extraction_pool() is not broken
+
+
+def test_parallel_extraction_matches_serial_page_order(tmp_path, monkeypatch, write_pdf):
+    path = write_pdf(tmp_path / "pages.pdf", [
+        [f"BT /F1 12 Tf 72 720 Td (Page {number}) Tj ET".encode()] if number != 3 else [b"q Q"]
+        for number in range(1, 8)
+    ])
+    kinds = PDFParser.scan_pages(path)
+    serial = PDFParser.extract_pages(path, max_workers=1, page_kinds=kinds)
+    parallel_calls = []
+    extract_parallel = PDFParser._extract_pages_parallel
+
+    def spy(*args):
+        parallel_calls.append(args)
+        return extract_parallel(*args)
+
+    monkeypatch.setattr(pdf_parser, "PARALLEL_PAGE_THRESHOLD", 4)
+    monkeypatch.setattr(pdf_parser, "EXTRACTION_POOL_SIZE", 3)
+    monkeypatch.setattr(PDFParser, "_extract_pages_parallel", staticmethod(spy))
+    parallel = PDFParser.extract_pages(path, max_workers=3, page_kinds=kinds)
+
+    assert len(parallel_calls) == 1
+    assert parallel == serial
+    assert [page.strip() for page in parallel] == ["Page 1", "Page 2", "", "Page 4", "Page 5", "Page 6", "Page 7"]
+
+
+INLINE_IMAGE_PAGE = [b"q 100 0 0 100 72 600 cm BI /W 1 /H 1 /BPC 8 /CS /G ID \x80 EI Q"]
+
+
+def test_image_only_document_is_reported_as_scanned(tmp_path, write_pdf):
+    path = write_pdf(tmp_path / "scanned.pdf", [INLINE_IMAGE_PAGE, INLINE_IMAGE_PAGE])
+
+    result = PDFParser.validate_document(path, {"requiredKeywords": ["zoning"]})
+
+    assert PDFParser.scan_pages(path) == ["image", "image"]
+    assert not result["valid"]
+    assert result["details"]["page_types"]["pages_without_text"] == [1, 2]
+    assert "scanned images only" in result["errors"][0]
+
+
+def test_image_pages_in_a_text_document_are_warned_about(tmp_path, write_pdf):
+    path = write_pdf(tmp_path / "partial.pdf", [
+        [b"BT /F1 12 Tf 72 720 Td (Zoning analysis) Tj ET"],
+        INLINE_IMAGE_PAGE,
+    ])
+
+    result = PDFParser.validate_document(path, {"requiredKeywords": ["zoning"]})
+
+    assert result["valid"]
+    assert result["warnings"] == ["1 page(s) are images with no text layer and were not checked: 2"]
@@ -0,0 +1,106 @@
+import time
+
+import pytest
+
+from app.models.project import Document, DocumentText, Project, ValidationResult
+from app.models.user import User
+from app.services import storage
+from app.services.storage import TRASH_DIR_NAME, FileSweeper
+
+
+def test_fields_returns_only_the_requested_slices(client, db, project):
+    db.add(Document(project_id=project.id, checklist_item_id="pw1", filename="pw1.pdf",
+                    file_path="/srv/uploads/pw1.pdf", file_size=10))
+    db.commit()
+
+    body = client.get(f"/api/projects/{project.id}", params={"fields": "status, documents"}).json()
+
+    assert set(body) == {"id", "version", "status", "documents"}
+    assert body["status"]["required_uploaded"] == 1
+    assert body["documents"][0]["filename"] == "pw1.pdf"
+    assert "file_path" not in body["documents"][0]
+
+
+def test_unknown_fields_are_rejected(client, project):
+    response = client.get(f"/api/projects/{project.id}", params={"fields": "status,owner"})
+
+    assert response.status_code == 400
+    assert "owner" in response.json()["detail"]
+
+
+def test_large_responses_are_gzipped(client, db, user):
+    checklist = [{"id": f"item-{number}", "name": f"Item {number}", "required": True} for number in range(100)]
+    project = Project(name="Big", jurisdiction="NYC", jurisdiction_data={"checklist": checklist}, user=user)
+    db.add(project)
+    db.commit()
+
+    response = client.get(f"/api/projects/{project.id}", params={"fields": "checklist"},
+                          headers={"Accept-Encoding": "gzip"})
+    small = client.get(f"/api/projects/{project.id}", params={"fields": "summary"},
+                       headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert len(response.json()["checklist"]) == 100
+    assert "content-encoding" not in small.headers
+
+
+@pytest.fixture
+def sweeper(tmp_path, monkeypatch):
+    sweeper = FileSweeper(tmp_path)
+    monkeypatch.setattr(storage, "file_sweeper", sweeper)
+    return sweeper
+
+
+def _project_with_upload(db, owner, upload_dir):
+    project = Project(name="P", jurisdiction="NYC", jurisdiction_data={}, user=owner)
+    db.add(project)
+    db.flush()
+    directory = upload_dir / str(project.id)
+    directory.mkdir()
+    (directory / "pw1.pdf").write_bytes(b"%PDF")
+    document = Document(project_id=project.id, checklist_item_id="pw1", filename="pw1.pdf",
+                        file_path=str(directory / "pw1.pdf"), file_size=4)
+    db.add(document)
+    db.flush()
+    db.add_all([
+        DocumentText(document_id=document.id, project_id=project.id, content="text"),
+        ValidationResult(project_id=project.id, checklist_item_id="pw1", status="pass"),
+    ])
+    db.commit()
+    return project.id
+
+
+def test_delete_removes_rows_and_detaches_uploads(client, db, user, sweeper, tmp_path):
+    project_id = _project_with_upload(db, user, tmp_path)
+
+    response = client.delete(f"/api/projects/{project_id}")
+
+    assert response.status_code == 200
+    assert response.json()["deleted_documents"] == 1
+    assert response.json()["bytes_scheduled"] == 4
+    # Detached before the response; the files themselves go in the background
+    assert not (tmp_path / str(project_id)).exists()
+    deadline = time.monotonic() + 5
+    while sweeper.report()["pending_jobs"] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert sweeper.report()["files_removed"] == 1
+    assert list((tmp_path / TRASH_DIR_NAME).iterdir()) == []
+    db.expire_all()
+    for model in (Project, Document, DocumentText, ValidationResult):
+        assert db.query(model).count() == 0
+
+
+def test_other_users_projects_are_not_deleted(client, db, user, sweeper, tmp_path):
+    other = User(email="o@example.com", username="o", hashed_password="x")
+    mine = _project_with_upload(db, user, tmp_path)
+    theirs = _project_with_upload(db, other, tmp_path)
+
+    assert client.delete(f"/api/projects/{theirs}").status_code == 404
+    response = client.post("/api/projects/bulk-delete", json={"project_ids": [mine, theirs]})
+
+    assert response.json()["deleted_projects"] == 1
+    db.expire_all()
+    assert [project.id for project in db.query(Project)] == [theirs]
+    assert db.query(Document).filter(Document.project_id == theirs).count() == 1
+    assert (tmp_path / str(theirs) / "pw1.pdf").exists()
+    assert not (tmp_path / str(mine)).exists()
@@ -0,0 +1,42 @@
+import pytest
+
+from app.models.project import Project
+
+
+@pytest.mark.parametrize("format", ["json", "html"])
+def test_matching_etag_is_revalidated_until_the_version_changes(client, db, project, format):
+    url = f"/api/projects/{project.id}/readiness?format={format}"
+    first = client.get(url)
+    etag = first.headers["etag"]
+
+    assert first.status_code == 200
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+    project.version += 1
+    db.commit()
+    changed = client.get(url, headers={"If-None-Match": etag})
+
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+
+
+def test_cached_body_holds_no_generation_time(client, project):
+    readiness = client.get(f"/api/projects/{project.id}/readiness").json()
+
+    assert "generated_at" not in readiness
+    assert readiness["status"] == "incomplete"
+    assert [item["id"] for item in readiness["missing_required"]] == ["pw1", "site-plan"]
+
+
+def test_project_without_required_items_is_ready(client, db, user):
+    checklist = [{"id": "survey", "name": "Survey", "required": False}]
+    project = Project(name="Shed", jurisdiction="NYC", jurisdiction_data={"checklist": checklist}, user=user)
+    db.add(project)
+    db.commit()
+
+    readiness = client.get(f"/api/projects/{project.id}/readiness").json()
+    status = client.get(f"/api/projects/{project.id}", params={"fields": "status"}).json()["status"]
+
+    assert readiness["status"] == "ready"
+    assert readiness["completion_percentage"] == 100
+    assert status["ready"] is True
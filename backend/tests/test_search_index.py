@@ -0,0 +1,69 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import app.models.user  # noqa: F401 - registers the users table for create_all
+from app.cli import index_documents
+from app.core.database import Base
+from app.models.project import Document, Project
+from app.models.user import User
+from app.services.search_index import index_document, init_search_index, search_documents, unindexed_documents
+
+TEXTS = {
+    "site.pdf": "Site plan showing the zoning district and front yard setback",
+    "pw1.pdf": "Applicant statement signed by the owner",
+    "survey.pdf": "Boundary survey with existing structures",
+}
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'search.db'}")
+    Base.metadata.create_all(bind=engine)
+    init_search_index(engine)
+    session = sessionmaker(bind=engine)()
+    user = User(email="u@example.com", username="u", hashed_password="x")
+    project = Project(name="P", jurisdiction="NYC", jurisdiction_data={}, user=user)
+    session.add(project)
+    session.flush()
+    for filename, text in TEXTS.items():
+        document = Document(project_id=project.id, checklist_item_id=filename, filename=filename, file_path=filename)
+        session.add(document)
+        session.flush()
+        index_document(session, document, text)
+    session.commit()
+    yield session, user.id
+    session.close()
+
+
+def _filenames(db, query):
+    session, user_id = db
+    return sorted(row["filename"] for row in search_documents(session, user_id, query))
+
+
+def test_each_excluded_term_drops_documents_on_its_own(db):
+    assert _filenames(db, "-zoning -owner") == ["survey.pdf"]
+    assert _filenames(db, "-owner -nonexistentword") == ["site.pdf", "survey.pdf"]
+
+
+def test_exclusions_combine_with_included_terms(db):
+    assert _filenames(db, "own* -zoning") == ["pw1.pdf"]
+    assert _filenames(db, "plan -survey -owner") == ["site.pdf"]
+
+
+def test_backfill_indexes_only_documents_without_text(db, tmp_path, write_pdf):
+    session, user_id = db
+    project = session.query(Project).first()
+    legacy = Document(project_id=project.id, checklist_item_id="survey", filename="legacy.pdf",
+                      file_path=write_pdf(tmp_path / "legacy.pdf", [[b"BT /F1 12 Tf 72 720 Td (Topographic survey) Tj ET"]]))
+    lost = Document(project_id=project.id, checklist_item_id="survey", filename="lost.pdf",
+                    file_path=str(tmp_path / "lost.pdf"))
+    session.add_all([legacy, lost])
+    session.commit()
+    messages = []
+
+    assert [document.filename for document in unindexed_documents(session)] == ["legacy.pdf", "lost.pdf"]
+    assert index_documents(session, messages.append) == 1
+    assert _filenames(db, "topographic") == ["legacy.pdf"]
+    assert [document.filename for document in unindexed_documents(session)] == ["lost.pdf"]
+    assert "file missing" in messages[1]
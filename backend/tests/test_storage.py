@@ -0,0 +1,26 @@
+import time
+
+from app.services.storage import TRASH_DIR_NAME, FileSweeper
+
+
+def _wait_for_jobs(sweeper, timeout=5):
+    deadline = time.monotonic() + timeout
+    while sweeper.report()["pending_jobs"] and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_pending_removal_spares_a_new_project_reusing_the_id(tmp_path):
+    sweeper = FileSweeper(tmp_path)
+    old_dir = tmp_path / "7"
+    old_dir.mkdir()
+    (old_dir / "old.pdf").write_bytes(b"old")
+
+    sweeper.remove_project_dirs([7])
+    # A project created straight afterwards with the same id uploads a file
+    old_dir.mkdir()
+    (old_dir / "new.pdf").write_bytes(b"new")
+    _wait_for_jobs(sweeper)
+
+    assert sorted(path.name for path in old_dir.iterdir()) == ["new.pdf"]
+    assert list((tmp_path / TRASH_DIR_NAME).iterdir()) == []
+    assert sweeper.report()["files_removed"] == 1
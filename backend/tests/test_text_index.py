@@ -0,0 +1,42 @@
+import pytest
+
+from app.services.pdf_parser import PDFParser
+from app.services.text_index import TextIndex
+
+
+@pytest.mark.parametrize("text, keyword, reason", [
+    ("minimum set-back from the lot line", "setback", "hyphen"),
+    ("minimum setback from the lot line", "set-back", "hyphen"),
+    ("minimum set-\nback from the lot line", "setback", "hyphenation"),
+    ("the fire-alarm plan", "fire alarm", "hyphen"),
+    ("site\nplan", "site plan", "line_break"),
+    ("site   plan", "site plan", "whitespace"),
+    ("Set-Back  Requirements", "set-back requirements", "whitespace"),
+    ("setback", "setback", "exact"),
+])
+def test_find_labels_what_differs(text, keyword, reason):
+    match = TextIndex(text).find(keyword)
+
+    assert match is not None
+    assert match["reason"] == reason
+
+
+def test_find_returns_offsets_of_the_matched_text():
+    text = "Provide the set-back dimension"
+    match = TextIndex(text).find("setback")
+
+    assert match["text"] == "set-back"
+    assert text[match["start"]:match["end"]] == "set-back"
+
+
+def test_validation_accepts_keywords_split_by_layout():
+    page = "Minimum set-\nback from the lot\nline per zoning"
+
+    result = PDFParser.validate_document("unused.pdf", {"requiredKeywords": ["setback", "lot line", "zoning"]},
+                                         pages=[page])
+
+    assert result["valid"]
+    assert {keyword: match["reason"] for keyword, match in result["details"]["keyword_matches"].items()} == {
+        "setback": "hyphenation", "lot line": "line_break", "zoning": "exact",
+    }
+    assert result["details"]["keywords"] == {"setback": True, "lot line": True, "zoning": True}
@@ -1,25 +1,21 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { Upload, CheckCircle, XCircle, AlertCircle, FileText, Download, Plus, ChevronRight, Loader, Trash2 } from 'lucide-react';
 
 const API_BASE_URL = 'http://localhost:8000/api';
 
-const jurisdictionFiles = {
-  'New York City, NY': '/data/jurisdictions/new-york-city.json',
-  'Los Angeles, CA': '/data/jurisdictions/los-angeles.json',
-  'San Francisco, CA': '/data/jurisdictions/san-francisco.json',
-  'Boston, MA': '/data/jurisdictions/boston.json',
-  'Washington, D.C.': '/data/jurisdictions/washington-dc.json'
-};
+const jurisdictionLabel = (j) => (j.name.includes(',') ? j.name : `${j.name}, ${j.state}`);
 
 const PermitReadinessApp = () => {
   const [view, setView] = useState('login');
   const [activeProject, setActiveProject] = useState(null);
   const [projects, setProjects] = useState([]);
+  const [jurisdictions, setJurisdictions] = useState([]);
   const [selectedJurisdiction, setSelectedJurisdiction] = useState('');
   const [projectName, setProjectName] = useState('');
   const [uploadedFiles, setUploadedFiles] = useState({});
   const [validationResults, setValidationResults] = useState({});
   const [showReport, setShowReport] = useState(false);
+  const [readiness, setReadiness] = useState(null);
   const [jurisdictionData, setJurisdictionData] = useState(null);
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState(null);
@@ -35,6 +31,7 @@ const PermitReadinessApp = () => {
   
   const [user, setUser] = useState(null);
   const [token, setToken] = useState(localStorage.getItem('token'));
+  const eventsSocket = useRef(null);
   const [loginForm, setLoginForm] = useState({ username: '', password: '' });
   const [registerForm, setRegisterForm] = useState({
     username: '',
@@ -43,8 +40,6 @@ const PermitReadinessApp = () => {
     full_name: ''
   });
 
-  const jurisdictions = Object.keys(jurisdictionFiles);
-
   useEffect(() => {
     if (token) {
       fetchCurrentUser();
@@ -54,6 +49,7 @@ const PermitReadinessApp = () => {
   useEffect(() => {
     if (user) {
       loadProjects();
+      loadJurisdictions();
     }
   }, [user]);
 
@@ -63,6 +59,37 @@ const PermitReadinessApp = () => {
     }
   }, [selectedJurisdiction, activeProject]);
 
+  // Validation results for the open project arrive over the events channel;
+  // uploads only fetch /validation themselves when the channel isn't open
+  useEffect(() => {
+    if (!activeProject || !token) return;
+
+    const socket = new WebSocket(
+      `${API_BASE_URL.replace(/^http/, 'ws')}/projects/${activeProject.id}/events?token=${encodeURIComponent(token)}`
+    );
+    eventsSocket.current = socket;
+    socket.onmessage = (message) => {
+      const event = JSON.parse(message.data);
+      if (event.type === 'validation_finished') {
+        setValidationResults(prev => ({
+          ...prev,
+          [event.checklist_item_id]: {
+            status: event.status,
+            notes: event.notes,
+            validated_at: event.timestamp
+          }
+        }));
+      }
+    };
+
+    return () => {
+      eventsSocket.current = null;
+      socket.close();
+    };
+  }, [activeProject?.id, token]);
+
+  const eventsConnected = () => eventsSocket.current?.readyState === WebSocket.OPEN;
+
   const fetchCurrentUser = async (authToken = null) => {
     const tokenToUse = authToken || token;
     
@@ -291,13 +318,23 @@ const PermitReadinessApp = () => {
     }
   };
 
+  const loadJurisdictions = async () => {
+    try {
+      const response = await fetch(`${API_BASE_URL}/jurisdictions/?view=slim`);
+      if (response.ok) {
+        setJurisdictions(await response.json());
+      }
+    } catch (err) {
+      console.error('Error loading jurisdictions:', err);
+    }
+  };
+
   const loadJurisdictionData = async (jurisdiction) => {
     setLoading(true);
     setError(null);
     
     try {
-      const filePath = jurisdictionFiles[jurisdiction];
-      const response = await fetch(filePath);
+      const response = await fetch(`${API_BASE_URL}/jurisdictions/${jurisdiction}`);
       
       if (!response.ok) {
         throw new Error(`HTTP error! status: ${response.status}`);
@@ -306,7 +343,8 @@ const PermitReadinessApp = () => {
       const data = await response.json();
       setJurisdictionData(data);
     } catch (err) {
-      setError(`Failed to load requirements for ${jurisdiction}: ${err.message}`);
+      const selected = jurisdictions.find(j => j.id === jurisdiction);
+      setError(`Failed to load requirements for ${selected ? jurisdictionLabel(selected) : jurisdiction}: ${err.message}`);
       console.error('Error loading jurisdiction data:', err);
     } finally {
       setLoading(false);
@@ -317,10 +355,11 @@ const PermitReadinessApp = () => {
     if (selectedJurisdiction && jurisdictionData && projectName.trim()) {
       setLoading(true);
       try {
+        const selected = jurisdictions.find(j => j.id === selectedJurisdiction);
         const project = await createProject({
           name: projectName.trim(),
-          jurisdiction: selectedJurisdiction,
-          jurisdiction_data: jurisdictionData
+          jurisdiction: jurisdictionLabel(selected),
+          jurisdiction_id: selectedJurisdiction
         });
 
         if (!project) {
@@ -432,7 +471,8 @@ const PermitReadinessApp = () => {
           }
         }));
         
-        if (file.name.toLowerCase().endsWith('.pdf')) {
+        // Fallback for when the events channel is unavailable
+        if (file.name.toLowerCase().endsWith('.pdf') && !eventsConnected()) {
           try {
             const validationResponse = await fetch(`${API_BASE_URL}/documents/${document.id}/validation`, {
               headers: {
@@ -483,6 +523,32 @@ const PermitReadinessApp = () => {
     }
   };
 
+  const handleShowReport = async () => {
+    if (!activeProject) return;
+    
+    const authToken = localStorage.getItem('token');
+    setLoading(true);
+    try {
+      const response = await fetch(`${API_BASE_URL}/projects/${activeProject.id}/readiness`, {
+        headers: {
+          'Authorization': `Bearer ${authToken}`
+        }
+      });
+      
+      if (response.ok) {
+        setReadiness(await response.json());
+        setShowReport(true);
+      } else {
+        alert('Failed to load readiness report');
+      }
+    } catch (err) {
+      console.error('Error loading readiness report:', err);
+      alert('Failed to load readiness report');
+    } finally {
+      setLoading(false);
+    }
+  };
+
   const handleDownloadReport = async () => {
     if (!activeProject) return;
     
@@ -516,13 +582,32 @@ const PermitReadinessApp = () => {
     }
   };
 
+  // Checklist edits carry the version we last loaded; on 409 someone else
+  // changed the project, so reload it instead of overwriting their edit
+  const patchChecklist = async (operations) => {
+    const authToken = localStorage.getItem('token');
+    const response = await fetch(`${API_BASE_URL}/projects/${activeProject.id}/checklist`, {
+      method: 'PATCH',
+      headers: {
+        'Content-Type': 'application/json',
+        'Authorization': `Bearer ${authToken}`
+      },
+      body: JSON.stringify({ version: activeProject.version, operations })
+    });
+
+    if (response.status === 409) {
+      setActiveProject(await loadProject(activeProject.id));
+      alert('This project was changed elsewhere and has been reloaded. Please try again.');
+    }
+    return response;
+  };
+
   const handleAddCustomItem = async () => {
     if (!activeProject || !customItemForm.name.trim()) {
       alert('Please enter a document name');
       return;
     }
 
-    const authToken = localStorage.getItem('token');
     setLoading(true);
     try {
       const customItem = {
@@ -536,14 +621,7 @@ const PermitReadinessApp = () => {
         custom: true
       };
 
-      const response = await fetch(`${API_BASE_URL}/projects/${activeProject.id}/custom-items`, {
-        method: 'POST',
-        headers: {
-          'Content-Type': 'application/json',
-          'Authorization': `Bearer ${authToken}`
-        },
-        body: JSON.stringify(customItem)
-      });
+      const response = await patchChecklist([{ op: 'add', item: customItem }]);
 
       if (response.ok) {
         const updatedProject = await loadProject(activeProject.id);
@@ -558,7 +636,7 @@ const PermitReadinessApp = () => {
           notes: ''
         });
         setShowAddCustomItem(false);
-      } else {
+      } else if (response.status !== 409) {
         alert('Failed to add custom item');
       }
     } catch (err) {
@@ -576,15 +654,9 @@ const PermitReadinessApp = () => {
       return;
     }
 
-    const authToken = localStorage.getItem('token');
     setLoading(true);
     try {
-      const response = await fetch(`${API_BASE_URL}/projects/${activeProject.id}/custom-items/${itemId}`, {
-        method: 'DELETE',
-        headers: {
-          'Authorization': `Bearer ${authToken}`
-        }
-      });
+      const response = await patchChecklist([{ op: 'remove', item_id: itemId }]);
 
       if (response.ok) {
         const updatedProject = await loadProject(activeProject.id);
@@ -593,7 +665,7 @@ const PermitReadinessApp = () => {
         const newFiles = { ...uploadedFiles };
         delete newFiles[itemId];
         setUploadedFiles(newFiles);
-      } else {
+      } else if (response.status !== 409) {
         alert('Failed to remove custom item');
       }
     } catch (err) {
@@ -878,7 +950,7 @@ const PermitReadinessApp = () => {
                 >
                   <option value="">Choose a city...</option>
                   {jurisdictions.map(j => (
-                    <option key={j} value={j}>{j}</option>
+                    <option key={j.id} value={j.id}>{jurisdictionLabel(j)}</option>
                   ))}
                 </select>
               </label>
@@ -1015,8 +1087,9 @@ const PermitReadinessApp = () => {
   const requiredCount = checklist.filter(i => i.required).length;
   const uploadedRequiredCount = checklist.filter(i => i.required && uploadedFiles[i.id]).length;
 
-  if (showReport) {
-    const missingRequired = checklist.filter(i => i.required && !uploadedFiles[i.id]);
+  if (showReport && readiness) {
+    // Computed server-side by the same model as the PDF report
+    const missingRequired = readiness.missing_required;
 
     return (
       <div className="min-h-screen bg-gray-50 p-8">
@@ -1049,14 +1122,14 @@ const PermitReadinessApp = () => {
                 </div>
                 <div>
                   <span className="text-gray-600">Status:</span>
-                  <span className={`ml-2 font-medium ${missingRequired.length === 0 ? 'text-green-600' : 'text-red-600'}`}>
-                    {missingRequired.length === 0 ? 'Ready for Submission' : 'Incomplete'}
+                  <span className={`ml-2 font-medium ${readiness.ready ? 'text-green-600' : 'text-red-600'}`}>
+                    {readiness.ready ? 'Ready for Submission' : 'Incomplete'}
                   </span>
                 </div>
               </div>
             </div>
 
-            {missingRequired.length === 0 ? (
+            {readiness.ready ? (
               <div className="bg-green-50 border border-green-200 rounded-lg p-6 mb-6">
                 <div className="flex items-center gap-3 mb-3">
                   <CheckCircle className="w-8 h-8 text-green-600" />
@@ -1086,11 +1159,11 @@ const PermitReadinessApp = () => {
             <div className="mb-6">
               <h3 className="text-lg font-semibold mb-3">Document Checklist</h3>
               <div className="space-y-2">
-                {checklist.map(item => (
+                {readiness.checklist.map(item => (
                   <div
                     key={item.id}
                     className={`flex items-center justify-between p-3 rounded-lg ${
-                      uploadedFiles[item.id]
+                      item.uploaded
                         ? 'bg-green-50 border border-green-200'
                         : item.required
                         ? 'bg-red-50 border border-red-200'
@@ -1098,7 +1171,7 @@ const PermitReadinessApp = () => {
                     }`}
                   >
                     <div className="flex items-center gap-3">
-                      {uploadedFiles[item.id] ? (
+                      {item.uploaded ? (
                         <CheckCircle className="w-5 h-5 text-green-600" />
                       ) : item.required ? (
                         <XCircle className="w-5 h-5 text-red-600" />
@@ -1111,7 +1184,7 @@ const PermitReadinessApp = () => {
                       )}
                     </div>
                     <span className="text-sm text-gray-600">
-                      {uploadedFiles[item.id] ? 'Uploaded' : 'Missing'}
+                      {item.uploaded ? 'Uploaded' : 'Missing'}
                     </span>
                   </div>
                 ))}
@@ -1127,7 +1200,7 @@ const PermitReadinessApp = () => {
                 <Download className="w-5 h-5" />
                 {loading ? 'Generating...' : 'Download PDF Report'}
               </button>
-              {missingRequired.length === 0 && (
+              {readiness.ready && (
                 <button className="flex-1 bg-green-600 text-white py-3 px-6 rounded-lg font-medium hover:bg-green-700">
                   Proceed to Submission
                 </button>
@@ -1454,7 +1527,7 @@ const PermitReadinessApp = () => {
                     All required documents uploaded
                   </p>
                   <button
-                    onClick={() => setShowReport(true)}
+                    onClick={handleShowReport}
                     className="w-full bg-green-600 text-white py-3 px-6 rounded-lg font-medium hover:bg-green-700 flex items-center justify-center gap-2"
                   >
                     <FileText className="w-5 h-5" />